@@ -2,7 +2,7 @@
 Core-Module für LogfileParser
 """
 
-from .log_parser import LogParser
+from .log_parser import LogParser, ParsePool
 from .csv_exporter import CSVExporter
 
-__all__ = ['LogParser', 'CSVExporter']
+__all__ = ['LogParser', 'ParsePool', 'CSVExporter']
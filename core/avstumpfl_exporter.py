@@ -3,8 +3,9 @@ CSV Exporter für AV Stumpfl Log-Parsing-Ergebnisse
 """
 
 import csv
+import os
 import re
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 from pathlib import Path
 from .error_categorizer import ErrorCategorizer
 
@@ -23,6 +24,9 @@ class AVStumpflCSVExporter:
     @staticmethod
     def _extract_count_from_description(description: str) -> Tuple[int, str]:
         """Extrahiert Anzahl aus Description wie '7x 'End of file''"""
+        # Die meisten Descriptions haben kein Anzahl-Präfix - Regex nur wenn sie mit einer Ziffer beginnen
+        if not description[:1].isdigit():
+            return 1, description
         match = re.match(r'^(\d+)x\s+(.+)$', description)
         if match:
             count = int(match.group(1))
@@ -123,7 +127,7 @@ class AVStumpflCSVExporter:
                     processed_rows.append(row)
         
         # Schreibe alle unique Zeilen
-        with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+        with open(output_file, 'w', newline='', encoding='utf-8-sig', buffering=1 << 20) as f:
             writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
             
             # Header schreiben
@@ -134,11 +138,78 @@ class AVStumpflCSVExporter:
             writer.writerow(header)
             
             # Daten schreiben
-            for row in processed_rows:
-                writer.writerow(row)
+            writer.writerows(processed_rows)
         
         return output_file
 
+    @staticmethod
+    def _iter_database_rows(database_file: Path) -> Iterator[List[str]]:
+        """
+        Liest die Datenbank-CSV zeilenweise, ohne alle Zeilen im Speicher zu halten
+        
+        Args:
+            database_file: Pfad zur Datenbank-CSV-Datei
+            
+        Returns:
+            Generator über die Zeilen als Liste der Spaltenwerte, die erste Zeile ist der Header
+        """
+        with open(database_file, 'r', encoding='utf-8-sig') as f:
+            yield from csv.reader(f)
+    
+    @staticmethod
+    def _iter_database_keys(database_file: Path) -> Iterator[str]:
+        """
+        Liest die Dedup-Keys (Severity|Type/Source|Description) der Datenbank-CSV zeilenweise
+        
+        Die Spaltenpositionen werden einmal aus dem Header bestimmt, statt für
+        jede Zeile ein Dict über alle Spalten aufzubauen.
+        
+        Args:
+            database_file: Pfad zur Datenbank-CSV-Datei
+            
+        Returns:
+            Generator über die Dedup-Keys der bestehenden Einträge
+        """
+        rows = AVStumpflCSVExporter._iter_database_rows(database_file)
+        header = next(rows, [])
+        # Bei doppelten Spaltennamen gewinnt wie bei DictReader die letzte Spalte
+        columns = {name: index for index, name in enumerate(header)}
+        severity_index = columns.get('Severity')
+        log_type_index = columns.get('Type/Source')
+        description_index = columns.get('Description')
+        
+        def field(row: List[str], index: Optional[int]) -> Optional[str]:
+            if index is None:
+                return ''  # Spalte fehlt in der Datenbank
+            return row[index] if index < len(row) else None  # Zu kurze Zeile wie DictReader
+        
+        for row in rows:
+            if not row:
+                continue  # Leerzeilen überspringt auch DictReader
+            yield f"{field(row, severity_index)}|{field(row, log_type_index)}|{field(row, description_index)}"
+    
+    @staticmethod
+    def _can_append_to_database(database_file: Path, header: List[str]) -> bool:
+        """
+        Prüft ob neue Zeilen direkt an die Datenbank angehängt werden können
+        
+        Das ist nur möglich, wenn die Datei bereits genau den geschriebenen
+        Header hat und wie vom csv-Modul geschrieben mit CRLF endet.
+        
+        Args:
+            database_file: Pfad zur Datenbank-CSV-Datei
+            header: Spalten, die geschrieben werden sollen
+            
+        Returns:
+            True wenn angehängt werden kann, sonst muss die Datei neu geschrieben werden
+        """
+        with open(database_file, 'r', newline='', encoding='utf-8-sig') as f:
+            if next(csv.reader(f), None) != header:
+                return False
+        with open(database_file, 'rb') as f:
+            f.seek(-2, os.SEEK_END)
+            return f.read(2) == b'\r\n'
+    
     @staticmethod
     def export_to_database(results: List[Tuple[str, str, str, str, str, str]], database_path: str,
                           anonymizer=None, add_category: bool = True):
@@ -157,22 +228,23 @@ class AVStumpflCSVExporter:
         database_file = Path(database_path)
         categorizer = ErrorCategorizer() if add_category else None
         
-        # Lade bestehende Einträge falls Datei existiert
-        existing_rows = []
+        # Bestimme Header
+        header = ['Log-Kategorie', 'Ordner', 'Logfile-Gruppe', 'Dateiname-Original', 'Anzahl']
+        if add_category:
+            header.append('Fehler-Kategorie')
+        header.extend(['Datum', 'Zeit', 'Severity', 'Type/Source', 'Description'])
+        
+        # Lese bestehende Einträge falls Datei existiert - nur die Dedup-Keys bleiben im Speicher
+        existing_count = 0
         existing_keys = set()
+        append = False
         
         if database_file.exists():
             try:
-                with open(database_file, 'r', encoding='utf-8-sig') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        existing_rows.append(row)
-                        # Erstelle Dedup-Key aus bestehenden Daten
-                        severity = row.get('Severity', '')
-                        log_type = row.get('Type/Source', '')
-                        description = row.get('Description', '')
-                        dedup_key = f"{severity}|{log_type}|{description}"
-                        existing_keys.add(dedup_key)
+                for dedup_key in AVStumpflCSVExporter._iter_database_keys(database_file):
+                    existing_count += 1
+                    existing_keys.add(dedup_key)
+                append = AVStumpflCSVExporter._can_append_to_database(database_file, header)
             except Exception as e:
                 print(f"Warnung: Konnte bestehende Datenbank nicht lesen: {e}")
         
@@ -180,6 +252,10 @@ class AVStumpflCSVExporter:
         new_rows = []
         new_count = 0
         
+        # Pfade, Types und Descriptions wiederholen sich stark - jeden Wert nur einmal anonymisieren
+        anonymized_paths = {}
+        anonymized_messages = {}
+        
         for logfile, date, time, severity, log_type, description in results:
             # Teile Pfad in Komponenten auf
             path = Path(logfile)
@@ -214,9 +290,16 @@ class AVStumpflCSVExporter:
             
             # Anonymisiere Daten wenn Anonymizer vorhanden
             if anonymizer:
-                remaining_path = anonymizer.anonymize_path(remaining_path) if remaining_path else ''
-                log_type = anonymizer.anonymize_message(log_type)
-                clean_description = anonymizer.anonymize_message(clean_description)
+                if remaining_path:
+                    if remaining_path not in anonymized_paths:
+                        anonymized_paths[remaining_path] = anonymizer.anonymize_path(remaining_path)
+                    remaining_path = anonymized_paths[remaining_path]
+                if log_type not in anonymized_messages:
+                    anonymized_messages[log_type] = anonymizer.anonymize_message(log_type)
+                log_type = anonymized_messages[log_type]
+                if clean_description not in anonymized_messages:
+                    anonymized_messages[clean_description] = anonymizer.anonymize_message(clean_description)
+                clean_description = anonymized_messages[clean_description]
             
             # Fehler-Kategorie ermitteln
             error_category = ''
@@ -247,24 +330,52 @@ class AVStumpflCSVExporter:
                 existing_keys.add(dedup_key)
                 new_count += 1
         
-        # Schreibe erweiterte Datenbank
-        with open(database_file, 'w', newline='', encoding='utf-8-sig') as f:
-            # Bestimme Header
-            header = ['Log-Kategorie', 'Ordner', 'Logfile-Gruppe', 'Dateiname-Original', 'Anzahl']
-            if add_category:
-                header.append('Fehler-Kategorie')
-            header.extend(['Datum', 'Zeit', 'Severity', 'Type/Source', 'Description'])
+        if append:
+            # Gleicher Header - neue Einträge nur anhängen statt die ganze Datenbank neu zu schreiben
+            with open(database_file, 'a', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.DictWriter(f, fieldnames=header)
+                writer.writerows(new_rows)
+        else:
+            # Anderer oder fehlender Header - bestehende Einträge in neuem Format übernehmen
+            database_header = []
+            existing_rows = []
+            if database_file.exists():
+                try:
+                    rows = AVStumpflCSVExporter._iter_database_rows(database_file)
+                    database_header = next(rows, [])
+                    for row in rows:
+                        if row:  # Leerzeilen überspringen
+                            existing_rows.append(row)
+                except Exception:
+                    pass  # Bereits oben gemeldet, bis dahin gelesene Zeilen bleiben erhalten
             
-            writer = csv.DictWriter(f, fieldnames=header)
-            writer.writeheader()
+            # Spalten der bestehenden Datenbank einmal auf den neuen Header abbilden
+            # (bei doppelten Spaltennamen gewinnt die letzte Spalte)
+            columns = {name: index for index, name in enumerate(database_header)}
+            column_indices = [columns.get(name) for name in header]
             
-            # Schreibe bestehende Einträge
-            for row in existing_rows:
-                writer.writerow(row)
+            # Spalten, die im neuen Header fehlen, würden verloren gehen - abbrechen bevor die Datei überschrieben wird
+            if existing_rows:
+                unknown_columns = [name for name in columns if name not in header]
+                if unknown_columns or any(len(row) > len(database_header) for row in existing_rows):
+                    raise ValueError(
+                        f"Datenbank enthält Spalten, die nicht geschrieben werden: "
+                        f"{', '.join(unknown_columns) or 'Werte ohne Header'}"
+                    )
             
-            # Schreibe neue Einträge
-            for row in new_rows:
-                writer.writerow(row)
+            # Schreibe erweiterte Datenbank
+            with open(database_file, 'w', newline='', encoding='utf-8-sig', buffering=1 << 20) as f:
+                writer = csv.DictWriter(f, fieldnames=header)
+                writer.writeheader()
+                
+                # Schreibe bestehende Einträge
+                csv.writer(f).writerows(
+                    [row[index] if index is not None and index < len(row) else '' for index in column_indices]
+                    for row in existing_rows
+                )
+                
+                # Schreibe neue Einträge
+                writer.writerows(new_rows)
         
-        total_entries = len(existing_rows) + new_count
+        total_entries = existing_count + new_count
         return database_file, new_count, total_entries
@@ -2,11 +2,50 @@
 AV Stumpfl Log Parser - Spezialisiert für AV Stumpfl Logfile-Format
 """
 
+import io
 import re
-from typing import List, Tuple, Callable
+import threading
+from hashlib import blake2b
+from typing import Iterable, List, Optional, Tuple, Callable
 from pathlib import Path
 import zipfile
-from core.log_parser import generalize_file_paths
+from core.log_parser import ParsePool, find_files, generalize_file_paths, open_nested_zip
+
+
+class _OrderedKeySet(dict):
+    """Ersatz für seen_errors in Worker-Prozessen, der die Reihenfolge der Dedup-Keys behält"""
+    
+    def add(self, key):
+        self[key] = None
+
+
+def _parse_file_worker(file_path: Path) -> Tuple[List[Tuple[bytes, tuple, str]], int, Optional[str]]:
+    """
+    Parst eine Logfile in einem Worker-Prozess
+    
+    Duplikate werden nur innerhalb der Datei erkannt - die globale
+    Duplikaterkennung übernimmt der aufrufende Prozess.
+    
+    Args:
+        file_path: Pfad zur Logfile
+        
+    Returns:
+        Tupel (Liste von (Dedup-Key, Ergebnis-Tupel, Fortschrittsmeldung) in Datei-Reihenfolge,
+        Anzahl dateiinterner Duplikate, Fehlermeldung oder None)
+    """
+    messages = []
+    parser = AVStumpflLogParser(progress_callback=messages.append)
+    parser.seen_errors = _OrderedKeySet()
+    error = None
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            parser._parse_log_content(f, str(file_path))
+    except Exception as e:
+        error = str(e)
+    
+    # Pro neuem Ergebnis gibt es genau einen Key und eine Meldung - in gleicher Reihenfolge
+    entries = list(zip(parser.seen_errors, parser.results, messages))
+    return entries, parser.skipped_duplicates, error
 
 
 class AVStumpflLogParser:
@@ -249,14 +288,25 @@ class AVStumpflLogParser:
         r'^(\w{3}\s+\d{2}\.\w{3}\.\s+)(\d{2}:\d{2}:\d{2}\.\d{3})\s+(INFO|ERROR|WARN|WARNING|FATAL|CRITICAL)\s+(.+)$'
     )
     
-    def __init__(self, progress_callback: Callable = None):
+    def __init__(self, progress_callback: Callable = None,
+                 file_progress_callback: Callable[[int, int], None] = None,
+                 cancel_event: threading.Event = None,
+                 pool: Optional[ParsePool] = None):
         """
         Initialisiert den AV Stumpfl LogParser
         
         Args:
             progress_callback: Callback-Funktion für Fortschrittsmeldungen
+            file_progress_callback: Callback (fertige Dateien, Dateien gesamt) nach jeder
+                Datei bzw. jedem ZIP-Archiv des aktuellen Verzeichnisses
+            cancel_event: Wenn gesetzt, bricht parse_directory nach der aktuellen Datei
+                ab und liefert die bis dahin gefundenen Ergebnisse
+            pool: ParsePool des Laufs für paralleles Parsen (ohne Pool wird seriell geparst)
         """
         self.progress_callback = progress_callback
+        self.file_progress_callback = file_progress_callback
+        self.cancel_event = cancel_event
+        self.pool = pool
         self.results = []
         self.seen_errors = set()
         self.skipped_duplicates = 0
@@ -268,8 +318,11 @@ class AVStumpflLogParser:
         WICHTIG: seen_errors wird NICHT zurückgesetzt, damit identische Fehler
         über mehrere Verzeichnisse/Logfiles hinweg nur einmal erfasst werden.
         
+        Statt eines Verzeichnisses kann auch ein ZIP-Archiv angegeben werden,
+        dessen Einträge dann direkt aus dem Archiv gelesen werden.
+        
         Args:
-            directory_path: Pfad zum Verzeichnis
+            directory_path: Pfad zum Verzeichnis (oder ZIP-Archiv)
             
         Returns:
             Liste von Tupeln (Logfilename, Datum, Zeit, Severity, Type, Description)
@@ -281,20 +334,83 @@ class AVStumpflLogParser:
         if not directory.exists():
             raise ValueError(f"Verzeichnis nicht gefunden: {directory_path}")
         
-        # Durchsuche alle .log und .txt Dateien rekursiv
-        log_files = list(directory.rglob('*.log')) + list(directory.rglob('*.txt'))
-        zip_files = list(directory.rglob('*.zip'))
+        # Durchsuche alle .log, .txt und .zip Dateien rekursiv (ein gemeinsamer Durchlauf)
+        found_files = find_files(directory, ('.log', '.txt', '.zip'))
+        log_files = found_files['.log'] + found_files['.txt']
+        zip_files = found_files['.zip']
+        
+        files_total = len(log_files) + len(zip_files)
+        file_progress_callback = self.file_progress_callback
         
         # Verarbeite Logfiles
-        for log_file in log_files:
-            self._parse_file(log_file)
+        if self.pool is not None and self.pool.worth_parallel(log_files):
+            self._parse_files_parallel(log_files, files_total)
+        else:
+            for files_done, log_file in enumerate(log_files, 1):
+                if self._cancelled():
+                    break
+                self._parse_file(log_file)
+                if file_progress_callback:
+                    file_progress_callback(files_done, files_total)
         
         # Verarbeite .zip Dateien
-        for zip_file in zip_files:
+        for files_done, zip_file in enumerate(zip_files, len(log_files) + 1):
+            if self._cancelled():
+                break
             self._parse_zip_file(zip_file)
+            if file_progress_callback:
+                file_progress_callback(files_done, files_total)
         
         return self.results
     
+    def _cancelled(self) -> bool:
+        """Prüft, ob das Parsen über cancel_event abgebrochen wurde"""
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
+    def _parse_files_parallel(self, file_paths: List[Path], files_total: int):
+        """
+        Parst mehrere Logfiles in Worker-Prozessen
+        
+        Die Ergebnisse werden in Datei-Reihenfolge übernommen, sodass die globale
+        Duplikaterkennung und die Fortschrittsmeldungen genauso ablaufen wie beim
+        seriellen Parsen.
+        
+        Args:
+            file_paths: Pfade zu den Logfiles
+            files_total: Anzahl aller Dateien des Verzeichnisses (für file_progress_callback)
+        """
+        seen_errors = self.seen_errors
+        results = self.results
+        progress_callback = self.progress_callback
+        
+        file_results = self.pool.map(_parse_file_worker, file_paths, progress_callback)
+        try:
+            for files_done, (file_path, (entries, skipped, error)) in enumerate(zip(file_paths, file_results), 1):
+                if self._cancelled():
+                    break
+                
+                if progress_callback:
+                    progress_callback(f"Verarbeite: {file_path.name}")
+                
+                for error_key, entry, message in entries:
+                    if error_key not in seen_errors:
+                        seen_errors.add(error_key)
+                        results.append(entry)
+                        if progress_callback:
+                            progress_callback(message)
+                    else:
+                        self.skipped_duplicates += 1
+                self.skipped_duplicates += skipped
+                
+                if error is not None and progress_callback:
+                    progress_callback(f"Fehler beim Lesen von {file_path.name}: {error}")
+                
+                if self.file_progress_callback:
+                    self.file_progress_callback(files_done, files_total)
+        finally:
+            # Storniert noch nicht gestartete Dateien (z.B. nach einem Abbruch)
+            file_results.close()
+    
     def _parse_file(self, file_path: Path):
         """
         Parst eine einzelne Logfile
@@ -306,47 +422,52 @@ class AVStumpflLogParser:
             self.progress_callback(f"Verarbeite: {file_path.name}")
         
         try:
+            # Zeilen werden direkt aus der Datei gelesen statt vorab als Liste
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                
-            self._parse_log_content(lines, str(file_path))
+                self._parse_log_content(f, str(file_path))
         
         except Exception as e:
             if self.progress_callback:
                 self.progress_callback(f"Fehler beim Lesen von {file_path.name}: {str(e)}")
     
-    def _parse_log_content(self, lines: List[str], source_name: str):
+    def _parse_log_content(self, lines: Iterable[str], source_name: str):
         """
         Parst den Inhalt einer Logfile
         
+        Die Zeilen werden nur einmal durchlaufen, sodass auch Datei-Objekte
+        oder Generatoren übergeben werden können.
+        
         Args:
             lines: Zeilen der Logfile
             source_name: Name der Quelle (Dateiname)
         """
-        i = 0
-        while i < len(lines):
-            line = lines[i].rstrip()
+        # Für alle Zeilen gleich - einmal vor der Schleife auflösen
+        match_format_1 = self.LOG_ENTRY_PATTERN_1.match
+        match_format_2 = self.LOG_ENTRY_PATTERN_2.match
+        match_format_3 = self.LOG_ENTRY_PATTERN_3.match
+        filter_severities = self.FILTER_SEVERITIES
+        seen_errors = self.seen_errors
+        
+        # Normalisiere Dateinamen für Duplikaterkennung (entferne Split-Suffixe)
+        # Wichtig: Entferne NUR Split-Suffixe am Ende, NICHT Teile des Dateinamens
+        # z.B. "playback-27103-1.log" → "playback-27103.log" (entferne -1)
+        # z.B. "playback-27103-WRITEABLE.log" → "playback-27103.log" (entferne -WRITEABLE)
+        # z.B. "playback-27103.log" → "playback-27103.log" (keine Änderung!)
+        original_filename = Path(source_name).name
+        # Entferne NUR kleine Zahlen (1-2 Ziffern) oder -WRITEABLE am Ende
+        # Verhindert, dass größere Zahlen wie -27103 entfernt werden
+        normalized_filename = re.sub(r'-(?:\d{1,2}|WRITEABLE)(?=\.(?:log|txt)$)', '', original_filename)
+        
+        lines = iter(lines)
+        raw_line = next(lines, None)
+        while raw_line is not None:
+            line = raw_line.rstrip()
             
             # Prüfe alle drei Log-Formate
-            match = None
-            pattern_type = None
-            
             # Format 1: DD.MM.YYYY HH:MM:SS SEVERITY Type
-            match = self.LOG_ENTRY_PATTERN_1.match(line)
-            if match:
-                pattern_type = 1
-            
             # Format 2: YYYY-MM-DD HH:MM:SS.mmm [LEVEL] Class.Method
-            if not match:
-                match = self.LOG_ENTRY_PATTERN_2.match(line)
-                if match:
-                    pattern_type = 2
-            
             # Format 3: Day DD.Mon. HH:MM:SS.mmm LEVEL Message
-            if not match:
-                match = self.LOG_ENTRY_PATTERN_3.match(line)
-                if match:
-                    pattern_type = 3
+            match = match_format_1(line) or match_format_2(line) or match_format_3(line)
             
             if match:
                 date = match.group(1)
@@ -355,41 +476,30 @@ class AVStumpflLogParser:
                 log_type = match.group(4).strip()
                 
                 # Prüfe ob dieser Severity-Level relevant ist
-                if severity_code in self.FILTER_SEVERITIES:
+                if severity_code in filter_severities:
                     # Lese die nächste(n) Zeile(n) für die Description
                     description_lines = []
-                    i += 1
+                    raw_line = next(lines, None)
                     
                     # Sammle alle eingerückten Folgezeilen
-                    while i < len(lines):
-                        next_line = lines[i].rstrip()
+                    while raw_line is not None:
+                        next_line = raw_line.rstrip()
                         
                         # Prüfe ob es ein neuer Log-Eintrag ist
-                        if (self.LOG_ENTRY_PATTERN_1.match(next_line) or 
-                            self.LOG_ENTRY_PATTERN_2.match(next_line) or
-                            self.LOG_ENTRY_PATTERN_3.match(next_line)):
+                        if (match_format_1(next_line) or
+                            match_format_2(next_line) or
+                            match_format_3(next_line)):
                             break
                         
                         # Füge eingerückte Zeile zur Description hinzu
                         if next_line.startswith('\t') or next_line.startswith('    '):
                             description_lines.append(next_line.strip())
-                            i += 1
+                            raw_line = next(lines, None)
                         else:
                             break
                     
                     description = '\n'.join(description_lines) if description_lines else ''
                     
-                    # Normalisiere Dateinamen für Duplikaterkennung (entferne Split-Suffixe)
-                    # Wichtig: Entferne NUR Split-Suffixe am Ende, NICHT Teile des Dateinamens
-                    # z.B. "playback-27103-1.log" → "playback-27103.log" (entferne -1)
-                    # z.B. "playback-27103-WRITEABLE.log" → "playback-27103.log" (entferne -WRITEABLE)
-                    # z.B. "playback-27103.log" → "playback-27103.log" (keine Änderung!)
-                    source_path = Path(source_name)
-                    original_filename = source_path.name
-                    # Entferne NUR kleine Zahlen (1-2 Ziffern) oder -WRITEABLE am Ende
-                    # Verhindert, dass größere Zahlen wie -27103 entfernt werden
-                    normalized_filename = re.sub(r'-(?:\d{1,2}|WRITEABLE)(?=\.(?:log|txt)$)', '', original_filename)
-                    
                     # Erstelle eindeutigen Schlüssel für Duplikatserkennung
                     # WICHTIG: Logfile-Name wird einbezogen, damit gleicher Fehler in
                     # verschiedenen Logfiles (rx-log vs pixera-log) separat erfasst wird
@@ -408,10 +518,16 @@ class AVStumpflLogParser:
                     # Dedup-Key enthält AUCH den normalisierten Dateinamen!
                     # Format: filename|severity|type|description
                     # Beispiel: "playback-27103.log|E|End of file|Error reading"
-                    error_key = f"{normalized_filename}|{severity_code}|{normalized_type}|{normalized_desc}"
+                    # Gespeichert wird nur ein 16-Byte-Digest des Schlüssels - der Schlüssel
+                    # selbst wird nirgends sonst gebraucht und wäre im Set deutlich größer
+                    error_key = blake2b(
+                        f"{normalized_filename}|{severity_code}|{normalized_type}|{normalized_desc}"
+                        .encode('utf-8', 'surrogatepass'),
+                        digest_size=16
+                    ).digest()
                     
-                    if error_key not in self.seen_errors:
-                        self.seen_errors.add(error_key)
+                    if error_key not in seen_errors:
+                        seen_errors.add(error_key)
                         
                         severity_name = self.SEVERITY_MAP.get(severity_code, severity_code)
                         
@@ -430,18 +546,19 @@ class AVStumpflLogParser:
                         
                         if self.progress_callback:
                             self.progress_callback(
-                                f"Fehler gefunden in {Path(source_name).name}: {severity_name.upper()} - {log_type}"
+                                f"Fehler gefunden in {original_filename}: {severity_name.upper()} - {log_type}"
                             )
                     else:
                         self.skipped_duplicates += 1
                     
+                    # raw_line ist bereits die nächste (noch nicht geprüfte) Zeile
                     continue
             
-            i += 1
+            raw_line = next(lines, None)
     
     def _parse_zip_file(self, zip_path: Path):
         """
-        Extrahiert und parst Logfiles aus einem ZIP-Archiv
+        Extrahiert und parst Logfiles aus einem ZIP-Archiv (inkl. darin liegender ZIP-Archive)
         
         Args:
             zip_path: Pfad zum ZIP-Archiv
@@ -451,26 +568,50 @@ class AVStumpflLogParser:
         
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Finde alle .log und .txt Dateien im ZIP
-                log_files = [f for f in zip_ref.namelist() 
-                           if f.endswith('.log') or f.endswith('.txt')]
+                self._parse_zip_members(zip_ref, f"{zip_path.name}/")
                 
-                for log_file in log_files:
+                # Im Archiv liegende ZIPs (früher nach dem Entpacken mit gefunden)
+                nested_zips = [f for f in zip_ref.namelist() if f.lower().endswith('.zip')]
+                for nested_zip in nested_zips:
                     try:
-                        # Lese Datei direkt aus ZIP
-                        with zip_ref.open(log_file) as f:
-                            content = f.read().decode('utf-8', errors='ignore')
-                            lines = content.splitlines(keepends=True)
-                            
-                            full_name = f"{zip_path.name}/{log_file}"
-                            self._parse_log_content(lines, full_name)
-                    
+                        with open_nested_zip(zip_ref, nested_zip) as nested_ref:
+                            self._parse_zip_members(nested_ref, f"{zip_path.name}/{nested_zip}/")
                     except Exception as e:
                         if self.progress_callback:
                             self.progress_callback(
-                                f"Fehler beim Lesen von {log_file} aus ZIP: {str(e)}"
+                                f"Fehler beim Lesen von {nested_zip} aus ZIP: {str(e)}"
                             )
         
         except Exception as e:
             if self.progress_callback:
                 self.progress_callback(f"Fehler beim Öffnen von ZIP {zip_path.name}: {str(e)}")
+    
+    def _parse_zip_members(self, zip_ref: zipfile.ZipFile, prefix: str):
+        """
+        Parst alle .log und .txt Einträge eines geöffneten ZIP-Archivs
+        
+        Args:
+            zip_ref: Geöffnetes Archiv
+            prefix: Wird den Eintragsnamen für den Logfilename vorangestellt
+        """
+        # Finde alle .log und .txt Dateien im ZIP
+        log_files = [f for f in zip_ref.namelist() 
+                   if f.endswith('.log') or f.endswith('.txt')]
+        
+        for log_file in log_files:
+            try:
+                # Lese Datei zeilenweise direkt aus ZIP, ohne den
+                # gesamten Inhalt vorab zu entpacken und zu dekodieren
+                with zip_ref.open(log_file) as raw, \
+                        io.TextIOWrapper(raw, encoding='utf-8', errors='ignore', newline='') as f:
+                    # str.splitlines() trennt zusätzlich an \x0b, \x1c, \u2028 usw.
+                    lines = (part for line in f for part in line.splitlines(keepends=True))
+                    
+                    full_name = f"{prefix}{log_file}"
+                    self._parse_log_content(lines, full_name)
+            
+            except Exception as e:
+                if self.progress_callback:
+                    self.progress_callback(
+                        f"Fehler beim Lesen von {log_file} aus ZIP: {str(e)}"
+                    )
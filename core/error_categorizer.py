@@ -3,7 +3,64 @@ Error Categorizer - Kategorisiert Fehler nach Typ
 """
 
 import re
-from typing import Tuple
+from typing import Dict, List, Tuple
+
+
+def _merge_patterns(patterns: List[str]) -> str:
+    """
+    Fasst die Patterns einer Kategorie zu einer einzigen Regex zusammen.
+    
+    Die Patterns werden an '.*' in Teilstücke zerlegt und in einem Trie
+    zusammengeführt, sodass gemeinsame Präfixe nur einmal geprüft werden:
+    
+        connection.*closed, connection.*refused → connection.*(?:closed|refused)
+    
+    Ist ein Pattern Präfix eines anderen (z.B. 'authenticating' und
+    'authenticating.*failed'), genügt das kürzere - das längere entfällt.
+    
+    Das Zerlegen ist nur korrekt, wenn jedes Teilstück für sich eine Regex
+    ohne Alternativen und Gruppen ist - andere Patterns werden abgelehnt.
+    
+    Args:
+        patterns: Regex-Patterns einer Kategorie
+        
+    Returns:
+        Zusammengefasstes Pattern (Treffer genau dann, wenn eines der Patterns trifft)
+        
+    Raises:
+        ValueError: Ein Pattern enthält '|', Gruppen oder lässt sich nicht an '.*' zerlegen
+    """
+    trie: Dict[str, dict] = {}
+    for pattern in patterns:
+        parts = pattern.split('.*')
+        for part in parts:
+            # '|' und Klammern würden beim Zusammenfassen ihre Bedeutung ändern;
+            # ein '.*' in einer Zeichenklasse oder nach '\\' ergibt ungültige Teilstücke
+            if '|' in part or '(' in part or ')' in part or not part:
+                raise ValueError(f"Pattern kann nicht zusammengefasst werden: {pattern!r}")
+            try:
+                re.compile(part)
+            except re.error as e:
+                raise ValueError(f"Pattern kann nicht zusammengefasst werden: {pattern!r} ({e})") from e
+        
+        node = trie
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[''] = {}  # Ende eines Patterns
+    
+    def build(node: Dict[str, dict]) -> str:
+        alternatives = []
+        for part, child in node.items():
+            if '' in child:
+                # Pattern endet hier - längere Fortsetzungen sind damit abgedeckt
+                alternatives.append(part)
+            else:
+                alternatives.append(part + '.*' + build(child))
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+    
+    return build(trie)
 
 
 class ErrorCategorizer:
@@ -69,6 +126,12 @@ class ErrorCategorizer:
         ]
     }
     
+    # Eine vorkompilierte Regex pro Kategorie (Reihenfolge wie CATEGORIES)
+    _CATEGORY_REGEXES = [
+        (category, re.compile(_merge_patterns(patterns), re.IGNORECASE))
+        for category, patterns in CATEGORIES.items()
+    ]
+    
     @staticmethod
     def categorize(error_message: str, error_type: str = '') -> str:
         """
@@ -84,11 +147,10 @@ class ErrorCategorizer:
         # Kombiniere error_type und error_message für bessere Erkennung
         combined_text = f"{error_type} {error_message}".lower()
         
-        # Prüfe jede Kategorie
-        for category, patterns in ErrorCategorizer.CATEGORIES.items():
-            for pattern in patterns:
-                if re.search(pattern, combined_text, re.IGNORECASE):
-                    return category
+        # Prüfe jede Kategorie (erste passende Kategorie gewinnt)
+        for category, regex in ErrorCategorizer._CATEGORY_REGEXES:
+            if regex.search(combined_text):
+                return category
         
         return 'Sonstige'
     
@@ -109,8 +171,20 @@ class ErrorCategorizer:
         else:
             short = description[:50].strip()
         
-        # Entferne häufige Prefix-Muster
-        short = re.sub(r'^\d+x\s+', '', short)  # Entferne "7x " Prefix
-        short = re.sub(r'^similar to\s+', '', short)  # Entferne "similar to" Prefix
+        # Entferne häufige Prefix-Muster (einfache String-Operationen statt Regex)
+        # Entferne "7x " Prefix
+        i = 0
+        while i < len(short) and short[i].isdecimal():
+            i += 1
+        if i and short[i:i + 1] == 'x':
+            rest = short[i + 1:].lstrip()
+            if len(rest) < len(short) - i - 1:  # Mindestens ein Whitespace nach dem "x"
+                short = rest
+        
+        # Entferne "similar to" Prefix
+        if short.startswith('similar to'):
+            rest = short[10:].lstrip()
+            if len(rest) < len(short) - 10:
+                short = rest
         
         return short if len(short) <= 50 else short[:47] + '...'
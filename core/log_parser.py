@@ -4,11 +4,113 @@ Log Parser - Extrahiert Fehler aus Logfiles
 
 import os
 import re
+import sys
+import queue
+import shutil
+import tempfile
+import threading
 import zipfile
-from typing import List, Tuple, Callable
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple, Callable
 from pathlib import Path
 
 
+# Platzhalter für Ersetzungen, die mehrere benannte Alternativen in einem
+# Durchlauf zusammenfassen (Schlüssel = Gruppenname)
+_GROUP_PLACEHOLDERS = {
+    'FILE_ID': '<FILE_ID>',
+    'HASH': '<HASH>',
+    'LRTB': 'LRTB: <COORDS>',
+    'Z_NF': 'Z-NF: <COORDS>',
+}
+
+
+def _replace_by_group(match) -> str:
+    """Liefert den Platzhalter zur getroffenen benannten Gruppe"""
+    return _GROUP_PLACEHOLDERS[match.lastgroup]
+
+
+# Ersetzungen für generalize_file_paths - einmalig beim Import kompiliert.
+# Die Reihenfolge ist wichtig: spätere Schritte arbeiten auf den Platzhaltern
+# der früheren.
+_GENERALIZE_SUBS = [
+    # 1. URL-encoded Pfade mit <?> Prefix - MUSS ZUERST kommen
+    # Matches: '<?>D:\path\file' oder '<?>\\server\share\file'
+    (re.compile(r'<\?>(?:[A-Za-z]:[/\\][^\'"\s]*|\\\\[^\'"\s]+)'), '<URL_PATH>'),
+    
+    # 2. UNC-Pfade (MÜSSEN VOR normalen Pfaden kommen)
+    # Matches: '\\192.168.1.5\share\file' oder '\\server\share\file'
+    # Zwei getrennte Durchläufe: die Hostnamen-Variante darf erst nach den
+    # IP-Pfaden greifen (z.B. bei '\\_202509301202\\192.168.1.5\...')
+    (re.compile(r'\\\\[\d.]+\\[^\'"\s]*'), '<UNC_PATH>'),
+    (re.compile(r'\\\\[A-Za-z0-9\-_.]+\\[^\'"\s]*'), '<UNC_PATH>'),
+    
+    # 3. Network srv:// Pfade
+    # Matches: 'srv://192.168.1.2/path/file.pfm'
+    (re.compile(r'srv://[\d.]+/[^\s\'\"]*'), '<SRV_PATH>'),
+    
+    # 4. Windows absolute Pfade (NACH UNC-Pfaden!)
+    # Matches: 'C:\path\file.mp4' oder 'D:/path/file.png'
+    # Wichtig: Nur Pfade die mit Laufwerksbuchstabe:\ oder :/ starten
+    (re.compile(r'[A-Za-z]:[/\\][^\'"\s]*'), '<DRIVE_PATH>'),
+    
+    # 5. IP-Adressen ohne Pfad
+    # Matches: '192.168.210.10:27102' oder '192.168.1.5'
+    (re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}(:\d+)?'), '<IP>'),
+    
+    # 6. Datei-IDs und Hashes (lange Zahlenfolgen/Hex-Strings)
+    # Diese werden NACH Pfad-Replacement durchgeführt, um auch IDs in Dateinamen zu erfassen
+    # Beide Varianten erfassen nur ganze Wörter und können sich nicht überlappen,
+    # daher ein gemeinsamer Durchlauf (Zahlen haben Vorrang vor Hashes)
+    (re.compile(
+        r'(?P<FILE_ID>\b\d{16,}\b)'  # Sehr lange Zahlen wie 4536398972959022_16660441324635355046
+        r'|(?P<HASH>\b[a-f0-9]{32,}\b)'  # MD5/SHA Hashes
+    ), _replace_by_group),
+    
+    # 7. Datums-/Zeit-Strings in Dateinamen (z.B. _202509301202, _202510032056)
+    # Ein eigener Durchlauf für _\d{14} danach traf nie (die ersten 12 Ziffern sind
+    # dann schon ersetzt) - daher nur dieser eine Durchlauf, mit identischem Ergebnis
+    (re.compile(r'_\d{12}'), '_<TIMESTAMP>'),  # _YYYYMMDDHHMI
+    
+    # 8. Pfad-Reste nach bereits ersetzten Platzhaltern entfernen
+    # Matches: '<URL_PATH> Resources\path\file' → '<URL_PATH>'
+    # Matches: '<DRIVE_PATH> Stumpfl/path/file' → '<DRIVE_PATH>'
+    # Wichtig: Muss auch mehrere Wörter/Pfad-Segmente erfassen bis zum nächsten Quote/Space
+    # Ein gemeinsamer Durchlauf für alle drei Platzhalter
+    (re.compile(r'<(URL|DRIVE|UNC)_PATH>\s+[^\'\"]*(?=[\'\"\\s]|$)'), r'<\1_PATH>'),
+    
+    # 9. UNC-Style Pfade mit Platzhalter-IP (//192.168.1.5/share/path)
+    (re.compile(r'//<IP>/[^\s:\'\"]*'), '//<IP>/<SHARE_PATH>'),
+    
+    # 10. Relative Pfade (SHM/path/file.pfm)
+    (re.compile(r'\b[A-Z]{2,}/[\w/._-]+\.\w+'), '<REL_PATH>'),
+    
+    # 11. Parameter-IDs (screen_id: 12850, target_id: 12852, mapping_id: 13127)
+    (re.compile(r'(\w+_id):\s*\d+'), r'\1: <ID>'),
+    
+    # 12. Output/Device/Port Nummern
+    (re.compile(r'\bOutput\s+\d+'), 'Output <NUM>'),
+    (re.compile(r'\bdevice\s+\d+'), 'device <NUM>'),
+    (re.compile(r'\bport\s+\d+'), 'port <NUM>'),
+    
+    # 13. Matrix-Koordinaten (LRTB: 0, 0, 0, 0 / Z-NF: 10, 5e+13)
+    (re.compile(
+        r'(?P<LRTB>LRTB:\s*[\d\.\-,\s]+)'
+        r'|(?P<Z_NF>Z-NF:\s*[\d\.\-,\se\+]+)'
+    ), _replace_by_group),
+]
+
+
+# Vorprüfung für generalize_file_paths: Jede Ersetzung oben benötigt mindestens
+# eines dieser Merkmale (Pfad-/Platzhalterzeichen, Ziffer, Koordinaten-Präfix
+# oder einen ziffernlosen Hex-Hash)
+_GENERALIZE_HINT = re.compile(r'[<\\/\d]|LRTB:|Z-NF:|[a-f]{32}')
+
+
 def generalize_file_paths(text: str) -> str:
     """
     Generalisiert Dateipfade in Fehlermeldungen für bessere Pattern-Erkennung.
@@ -33,68 +135,487 @@ def generalize_file_paths(text: str) -> str:
         >>> generalize_file_paths("error on \\\\\\\\192.168.1.5\\\\share\\\\file.mov")
         "error on <UNC_PATH> failed"
     """
-    # Kopie des Textes erstellen
+    # Texte ohne jedes Merkmal, auf das eine Ersetzung ansprechen könnte
+    # (z.B. leere AV Stumpfl Descriptions), nicht durch alle Passes schicken
+    if not _GENERALIZE_HINT.search(text):
+        return text
+
     result = text
+    for pattern, replacement in _GENERALIZE_SUBS:
+        result = pattern.sub(replacement, result)
     
-    # 1. URL-encoded Pfade mit <?> Prefix - MUSS ZUERST kommen
-    # Matches: '<?>D:\path\file' oder '<?>\\server\share\file'
-    result = re.sub(r'<\?>[A-Za-z]:[/\\][^\'"\s]*', '<URL_PATH>', result)
-    result = re.sub(r'<\?>\\\\[^\'"\s]+', '<URL_PATH>', result)
+    return result
+
+
+# Severity-Keywords für die Vorauswahl auf Byte-Ebene (vor dem Dekodieren)
+_SEVERITY_KEYWORDS = (b'error', b'fatal', b'critical', b'warning')
+
+# Blockgröße beim Einlesen von Logfiles
+_READ_BLOCK_SIZE = 1 << 20
+
+
+def _read_line_blocks(f, block_size: int = _READ_BLOCK_SIZE):
+    """
+    Liest eine binär geöffnete Datei in großen Blöcken, die jeweils an einem
+    Zeilenende (\n) enden
     
-    # 2. UNC-Pfade (MÜSSEN VOR normalen Pfaden kommen)
-    # Matches: '\\192.168.1.5\share\file' oder '\\server\share\file'
-    result = re.sub(r'\\\\[\d.]+\\[^\'"\s]*', '<UNC_PATH>', result)
-    result = re.sub(r'\\\\[A-Za-z0-9\-_.]+\\[^\'"\s]*', '<UNC_PATH>', result)
+    Args:
+        f: Binär geöffnete Datei
+        block_size: Anzahl Bytes pro Lesevorgang
+        
+    Yields:
+        Blöcke aus vollständigen Zeilen (der letzte ggf. ohne abschließendes \n)
+    """
+    pending = []  # Angefangene Zeile aus vorherigen Lesevorgängen
+    while True:
+        chunk = f.read(block_size)
+        if not chunk:
+            if pending:
+                yield b''.join(pending)
+            return
+        
+        cut = chunk.rfind(b'\n') + 1
+        if not cut:
+            # Noch kein Zeilenende - Stücke sammeln statt immer wieder zu verketten
+            pending.append(chunk)
+            continue
+        
+        pending.append(chunk[:cut])
+        yield b''.join(pending)
+        pending = [chunk[cut:]] if cut < len(chunk) else []
+
+
+def _iter_severity_lines(data: bytes):
+    """
+    Liefert alle Zeilen (getrennt an \n) eines Byte-Puffers, die eines der
+    Severity-Keywords enthalten (ASCII, Groß-/Kleinschreibung egal)
     
-    # 3. Network srv:// Pfade
-    # Matches: 'srv://192.168.1.2/path/file.pfm'
-    result = re.sub(r'srv://[\d.]+/[^\s\'\"]*', '<SRV_PATH>', result)
+    Die Suche läuft blockweise mit bytes.find() statt Zeile für Zeile in Python,
+    Zeilen ohne Keyword werden nie einzeln angefasst.
     
-    # 4. Windows absolute Pfade (NACH UNC-Pfaden!)
-    # Matches: 'C:\path\file.mp4' oder 'D:/path/file.png'
-    # Wichtig: Nur Pfade die mit Laufwerksbuchstabe:\ oder :/ starten
-    result = re.sub(r'[A-Za-z]:[/\\][^\'"\s]*', '<DRIVE_PATH>', result)
+    Args:
+        data: Byte-Puffer aus vollständigen Zeilen
+        
+    Yields:
+        Gefundene Zeilen (inkl. \n) in Puffer-Reihenfolge
+    """
+    data_lower = data.lower()
+    spans = set()
+    for keyword in _SEVERITY_KEYWORDS:
+        pos = data_lower.find(keyword)
+        while pos >= 0:
+            start = data_lower.rfind(b'\n', 0, pos) + 1
+            end = data_lower.find(b'\n', pos) + 1 or len(data_lower)
+            spans.add((start, end))
+            pos = data_lower.find(keyword, end)
     
-    # 5. IP-Adressen ohne Pfad
-    # Matches: '192.168.210.10:27102' oder '192.168.1.5'
-    result = re.sub(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}(:\d+)?', '<IP>', result)
+    for start, end in sorted(spans):
+        yield data[start:end]
+
+
+# Verschachtelte ZIP-Archive bis zu dieser Größe im Speicher, größere in einer temporären Datei
+_NESTED_ZIP_SPOOL_SIZE = 64 << 20
+
+
+@contextmanager
+def open_nested_zip(zip_ref: zipfile.ZipFile, name: str):
+    """
+    Öffnet ein ZIP-Archiv, das als Eintrag in einem anderen ZIP-Archiv liegt
     
-    # 6. Datei-IDs und Hashes (lange Zahlenfolgen/Hex-Strings)
-    # Diese werden NACH Pfad-Replacement durchgeführt, um auch IDs in Dateinamen zu erfassen
-    result = re.sub(r'\b\d{16,}\b', '<FILE_ID>', result)  # Sehr lange Zahlen wie 4536398972959022_16660441324635355046
-    result = re.sub(r'\b[a-f0-9]{32,}\b', '<HASH>', result)  # MD5/SHA Hashes
+    ZipFile braucht wahlfreien Zugriff, daher wird der (gepackte) Eintrag zuerst
+    kopiert - bis _NESTED_ZIP_SPOOL_SIZE in den Speicher, sonst in eine
+    temporäre Datei, die beim Verlassen wieder gelöscht wird.
     
-    # 7. Datums-/Zeit-Strings in Dateinamen (z.B. _202509301202, _202510032056)
-    result = re.sub(r'_\d{12}', '_<TIMESTAMP>', result)  # _YYYYMMDDHHMI
-    result = re.sub(r'_\d{14}', '_<TIMESTAMP>', result)  # _YYYYMMDDHHMMSS
+    Args:
+        zip_ref: Geöffnetes äußeres Archiv
+        name: Name des .zip Eintrags
+        
+    Yields:
+        Geöffnetes inneres Archiv
+    """
+    with tempfile.SpooledTemporaryFile(max_size=_NESTED_ZIP_SPOOL_SIZE) as spool:
+        with zip_ref.open(name) as source:
+            shutil.copyfileobj(source, spool, _READ_BLOCK_SIZE)
+        spool.seek(0)
+        with zipfile.ZipFile(spool, 'r') as nested_ref:
+            yield nested_ref
+
+
+# Abbruch-Signal des Laufs in Worker-Prozessen (gesetzt von _init_pool_worker)
+_worker_cancel_event = None
+
+
+def _init_pool_worker(cancel_event):
+    """Initialisiert einen Worker-Prozess von ParsePool"""
+    global _worker_cancel_event
+    _worker_cancel_event = cancel_event
+
+
+class ParsePool:
+    """
+    Worker-Prozesse für einen ganzen Parse-Lauf
     
-    # 8. Pfad-Reste nach bereits ersetzten Platzhaltern entfernen
-    # Matches: '<URL_PATH> Resources\path\file' → '<URL_PATH>'
-    # Matches: '<DRIVE_PATH> Stumpfl/path/file' → '<DRIVE_PATH>'
-    # Wichtig: Muss auch mehrere Wörter/Pfad-Segmente erfassen bis zum nächsten Quote/Space
-    result = re.sub(r'<URL_PATH>\s+[^\'\"]*(?=[\'\"\\s]|$)', '<URL_PATH>', result)
-    result = re.sub(r'<DRIVE_PATH>\s+[^\'\"]*(?=[\'\"\\s]|$)', '<DRIVE_PATH>', result)
-    result = re.sub(r'<UNC_PATH>\s+[^\'\"]*(?=[\'\"\\s]|$)', '<UNC_PATH>', result)
+    Ein Pool wird einmal pro Lauf erstellt und von allen Verzeichnissen genutzt,
+    damit die Worker-Prozesse (unter Windows per spawn, inkl. erneutem Import der
+    Module) nur einmal gestartet werden - und auch erst, wenn tatsächlich parallel
+    geparst wird. Stürzt ein Worker-Prozess ab, wird im aufrufenden Prozess
+    seriell weitergearbeitet. Ein Abbruch wird über ein multiprocessing.Event an
+    die Worker weitergegeben. Nach dem Lauf muss close() aufgerufen werden.
+    """
     
-    # 9. UNC-Style Pfade mit Platzhalter-IP (//192.168.1.5/share/path)
-    result = re.sub(r'//<IP>/[^\s:\'\"]*', '//<IP>/<SHARE_PATH>', result)
+    # Ab dieser Gesamtgröße der Dateien wird auf mehrere Prozesse verteilt
+    # (darunter überwiegt die Übergabe der Ergebnisse an den aufrufenden Prozess)
+    PARALLEL_MIN_BYTES = 16 << 20
     
-    # 10. Relative Pfade (SHM/path/file.pfm)
-    result = re.sub(r'\b[A-Z]{2,}/[\w/._-]+\.\w+', '<REL_PATH>', result)
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialisiert den Pool (ohne Worker-Prozesse zu starten)
+        
+        Args:
+            max_workers: Anzahl Worker-Prozesse (Standard: Anzahl CPUs)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._cancel_event = None  # multiprocessing.Event, in den Workern _worker_cancel_event
+        self._broken = False
     
-    # 11. Parameter-IDs (screen_id: 12850, target_id: 12852, mapping_id: 13127)
-    result = re.sub(r'(\w+_id):\s*\d+', r'\1: <ID>', result)
+    @property
+    def available(self) -> bool:
+        """True, solange paralleles Parsen möglich ist (mehrere CPUs, kein abgestürzter Worker)"""
+        return self.max_workers > 1 and not self._broken
     
-    # 12. Output/Device/Port Nummern
-    result = re.sub(r'\bOutput\s+\d+', 'Output <NUM>', result)
-    result = re.sub(r'\bdevice\s+\d+', 'device <NUM>', result)
-    result = re.sub(r'\bport\s+\d+', 'port <NUM>', result)
+    def worth_parallel(self, file_paths: List[Path]) -> bool:
+        """
+        Prüft, ob sich das Verteilen der Dateien auf Worker-Prozesse lohnt
+        
+        Args:
+            file_paths: Zu parsende Dateien
+            
+        Returns:
+            True, wenn der Pool verfügbar ist und die Dateien zusammen mindestens
+            PARALLEL_MIN_BYTES groß sind
+        """
+        if not self.available or len(file_paths) < 2:
+            return False
+        
+        total_bytes = 0
+        for file_path in file_paths:
+            try:
+                total_bytes += os.path.getsize(file_path)
+            except OSError:
+                # Nicht lesbare Dateien meldet das Parsen selbst
+                continue
+            if total_bytes >= self.PARALLEL_MIN_BYTES:
+                return True
+        return False
     
-    # 13. Matrix-Koordinaten (LRTB: 0, 0, 0, 0 / Z-NF: 10, 5e+13)
-    result = re.sub(r'LRTB:\s*[\d\.\-,\s]+', 'LRTB: <COORDS>', result)
-    result = re.sub(r'Z-NF:\s*[\d\.\-,\se\+]+', 'Z-NF: <COORDS>', result)
+    def submit(self, fn: Callable, *args):
+        """
+        Startet eine Aufgabe in einem Worker-Prozess (der Pool wird beim ersten Aufruf gestartet)
+        
+        Raises:
+            BrokenProcessPool: Ein Worker-Prozess ist abgestürzt
+        """
+        if self._executor is None:
+            context = multiprocessing.get_context()
+            self._cancel_event = context.Event()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_pool_worker,
+                initargs=(self._cancel_event,)
+            )
+        try:
+            return self._executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._broken = True
+            raise
     
-    return result
+    def result(self, future, cancelled: Callable[[], bool] = None):
+        """
+        Wartet auf das Ergebnis einer Aufgabe
+        
+        Args:
+            future: Future aus submit()
+            cancelled: Wird während des Wartens abgefragt - liefert es True, wird
+                das Abbruch-Signal an die Worker weitergegeben, die dann nach
+                ihrer aktuellen Datei ihr bisheriges Ergebnis liefern
+        
+        Raises:
+            BrokenProcessPool: Ein Worker-Prozess ist abgestürzt
+        """
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except FuturesTimeoutError:
+                if cancelled is not None and cancelled():
+                    self._cancel_event.set()
+                    cancelled = None
+            except BrokenProcessPool:
+                self._broken = True
+                raise
+    
+    def map(self, fn: Callable, items: List, progress_callback: Callable = None) -> Iterator:
+        """
+        Wendet fn in den Worker-Prozessen auf alle Elemente an
+        
+        Es sind höchstens 2 * max_workers Aufgaben gleichzeitig unterwegs, damit
+        fertige Ergebnisse nicht unbegrenzt auf Abholung warten. Bricht der
+        Aufrufer die Iteration ab, werden noch nicht gestartete Aufgaben storniert.
+        Stürzt ein Worker-Prozess ab, werden die restlichen Elemente mit fn im
+        aufrufenden Prozess verarbeitet.
+        
+        Args:
+            fn: Picklebare Funktion auf Modulebene
+            items: Zu verarbeitende Elemente
+            progress_callback: Erhält eine Meldung, wenn auf seriell umgeschaltet wird
+            
+        Yields:
+            Ergebnisse von fn in Reihenfolge der Elemente
+        """
+        window = 2 * self.max_workers
+        futures = deque()
+        submitted = 0
+        try:
+            for index, item in enumerate(items):
+                if self.available:
+                    try:
+                        while submitted < len(items) and submitted <= index + window:
+                            futures.append(self.submit(fn, items[submitted]))
+                            submitted += 1
+                        result = self.result(futures.popleft())
+                    except BrokenProcessPool:
+                        futures.clear()
+                        if progress_callback:
+                            progress_callback("Worker-Prozess abgestürzt - parse seriell weiter")
+                        result = fn(item)
+                else:
+                    result = fn(item)
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    def close(self):
+        """
+        Beendet die Worker-Prozesse
+        
+        Noch nicht gestartete Aufgaben werden storniert, laufende erhalten das
+        Abbruch-Signal - gewartet wird nur noch, bis die Worker ihre aktuelle
+        Datei beendet haben.
+        """
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        
+        self._cancel_event.set()
+        try:
+            executor.shutdown(wait=True, cancel_futures=True)
+        except TypeError:
+            # Python 3.8 kennt cancel_futures noch nicht - dann laufen die Aufgaben zu Ende
+            executor.shutdown(wait=True)
+
+def find_files(directory: Path, suffixes: Tuple[str, ...]) -> Dict[str, List[Path]]:
+    """
+    Sucht in einem Durchlauf rekursiv alle Dateien mit den angegebenen Endungen
+    
+    Die Reihenfolge entspricht der von Path.rglob() (Verzeichnisse in
+    Pre-Order, innerhalb eines Verzeichnisses in Einlese-Reihenfolge).
+    Symbolische Links auf Verzeichnisse werden wie dort nicht verfolgt.
+    Ist directory eine Datei, wird nur diese Datei zugeordnet: passt keine
+    Endung (ohne Beachtung der Groß-/Kleinschreibung), gilt sie als ZIP-Archiv -
+    als Datei werden nur ZIP-Archive hinzugefügt, auch ohne Endung .zip.
+    
+    Args:
+        directory: Zu durchsuchendes Verzeichnis (oder einzelne Datei)
+        suffixes: Gesuchte Endungen in Kleinbuchstaben (z.B. ('.txt', '.zip'))
+        
+    Returns:
+        Dict Endung → Liste der gefundenen Dateien
+    """
+    found = {suffix: [] for suffix in suffixes}
+    
+    if directory.is_file():
+        name = directory.name.lower()
+        for suffix in suffixes:
+            if name.endswith(suffix):
+                found[suffix].append(directory)
+                break
+        else:
+            if '.zip' in found:
+                found['.zip'].append(directory)
+        return found
+    
+    for root, _, names in os.walk(directory):
+        root_path = Path(root)
+        for name in names:
+            # normcase: unter Windows ohne Beachtung der Groß-/Kleinschreibung (wie rglob)
+            normalized = os.path.normcase(name)
+            for suffix in suffixes:
+                if normalized.endswith(suffix):
+                    found[suffix].append(root_path / name)
+                    break
+    
+    return found
+
+
+class _ZipEntryPrefetcher:
+    """
+    Liest und entpackt .txt Einträge aus ZIP-Archiven in einem Hintergrund-Thread,
+    inklusive der .txt Einträge von ZIP-Archiven, die im Archiv liegen (eine Ebene).
+    
+    Die Einträge werden blockweise (siehe _read_line_blocks) über eine begrenzte
+    Queue an den parsenden Thread übergeben, damit das Entpacken (zlib gibt dabei
+    den GIL frei) mit dem Parsen der .txt Dateien überlappt, ohne dass ganze
+    entpackte Einträge im Speicher liegen.
+    
+    Liefert Tupel (Art, ZIP-Pfad, Eintragsname, Nutzdaten) in Archiv-Reihenfolge:
+    - ('zip', zip_path, None, None): Beginn eines neuen Archivs
+    - ('block', zip_path, name, bytes): Block ganzer Zeilen eines .txt Eintrags
+    - ('entry_error', zip_path, name, exception): Eintrag nicht (weiter) lesbar
+    - ('zip_error', zip_path, None, exception): Archiv nicht lesbar
+    
+    Einträge eines inneren Archivs heißen '<inneres Archiv>/<Eintrag>'.
+    """
+    
+    # Maximale Anzahl entpackter Blöcke, die auf Verarbeitung warten
+    MAX_PENDING = 4
+    
+    def __init__(self, zip_files: List[Path]):
+        self._zip_files = zip_files
+        self._queue = queue.Queue(maxsize=self.MAX_PENDING)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read_all, daemon=True)
+    
+    def start(self):
+        """Startet das Lesen im Hintergrund"""
+        self._thread.start()
+        return self
+    
+    def close(self):
+        """Bricht das Lesen ab (z.B. wenn der Konsument vorzeitig aussteigt)"""
+        self._stop.set()
+    
+    def _put(self, item) -> bool:
+        """Legt ein Element in die Queue, solange nicht abgebrochen wurde"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _read_all(self):
+        """Thread-Funktion: liest alle .txt Einträge aller Archive"""
+        try:
+            for zip_path in self._zip_files:
+                if not self._put(('zip', zip_path, None, None)):
+                    return
+                try:
+                    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                        if not self._read_entries(zip_ref, zip_path):
+                            return
+                        
+                        # Im Archiv liegende ZIPs (früher nach dem Entpacken mit gefunden)
+                        nested_zips = [f for f in zip_ref.namelist() if f.lower().endswith('.zip')]
+                        for nested_zip in nested_zips:
+                            try:
+                                with open_nested_zip(zip_ref, nested_zip) as nested_ref:
+                                    if not self._read_entries(nested_ref, zip_path, f"{nested_zip}/"):
+                                        return
+                            except Exception as e:
+                                if not self._put(('entry_error', zip_path, nested_zip, e)):
+                                    return
+                except Exception as e:
+                    if not self._put(('zip_error', zip_path, None, e)):
+                        return
+        finally:
+            # Ende-Markierung (auch nach Abbruch, damit kein Konsument hängen bleibt)
+            self._put(None)
+    
+    def _read_entries(self, zip_ref: zipfile.ZipFile, zip_path: Path, prefix: str = '') -> bool:
+        """
+        Liest alle .txt Einträge eines Archivs blockweise direkt aus dem ZIP
+        
+        Args:
+            zip_ref: Geöffnetes Archiv (zip_path oder ein darin liegendes ZIP)
+            zip_path: Pfad zum ZIP-Archiv auf der Platte
+            prefix: Wird den Eintragsnamen vorangestellt
+        
+        Returns:
+            False, wenn abgebrochen wurde
+        """
+        # Finde alle .txt Dateien im ZIP
+        txt_files = [f for f in zip_ref.namelist() if f.endswith('.txt')]
+        
+        for txt_file in txt_files:
+            name = prefix + txt_file
+            try:
+                with zip_ref.open(txt_file) as f:
+                    for block in _read_line_blocks(f):
+                        if not self._put(('block', zip_path, name, block)):
+                            return False
+            except Exception as e:
+                if not self._put(('entry_error', zip_path, name, e)):
+                    return False
+        return True
+    
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            yield item
+
+
+def _parse_file_worker(file_path: Path) -> Tuple[List[Tuple[str, str]], int, Optional[str]]:
+    """
+    Parst eine .txt Datei in einem Worker-Prozess
+    
+    Duplikate werden nur innerhalb der Datei erkannt - die globale
+    Duplikaterkennung übernimmt der aufrufende Prozess.
+    
+    Args:
+        file_path: Pfad zur Logfile
+        
+    Returns:
+        Tupel (Liste von (Severity, generalisierte Zeile) in Datei-Reihenfolge,
+        Anzahl dateiinterner Duplikate, Fehlermeldung oder None)
+    """
+    parser = LogParser()
+    error = None
+    try:
+        parser._read_file(file_path)
+    except Exception as e:
+        error = str(e)
+    
+    errors = [(severity, line) for _, severity, line in parser.results]
+    return errors, parser.skipped_duplicates, error
+
+
+def _parse_directory_worker(directory_path: str) -> Tuple[List[Tuple[str, str, str]], int, list]:
+    """
+    Parst ein ganzes Verzeichnis in einem Worker-Prozess (siehe LogParser.prefetch_directories)
+    
+    Der Parser im Worker erhält keinen ParsePool, die Dateien werden also seriell
+    geparst, damit keine verschachtelten Prozess-Pools entstehen. Fortschrittsmeldungen werden aufgezeichnet und im
+    aufrufenden Prozess in derselben Reihenfolge wiedergegeben. Wird der Lauf
+    abgebrochen, endet das Parsen nach der aktuellen Datei.
+    
+    Args:
+        directory_path: Pfad zum Verzeichnis
+        
+    Returns:
+        Tupel (Ergebnisse, Anzahl übersprungener Duplikate, Ereignisse - Meldungstexte
+        und (fertige Dateien, Dateien gesamt) in Aufruf-Reihenfolge)
+    """
+    events = []
+    parser = LogParser(progress_callback=events.append,
+                       file_progress_callback=lambda done, total: events.append((done, total)),
+                       cancel_event=_worker_cancel_event)
+    results = parser.parse_directory(directory_path)
+    return results, parser.skipped_duplicates, events
 
 
 class LogParser:
@@ -103,28 +624,91 @@ class LogParser:
     # Severity-Level die gesucht werden sollen
     SEVERITY_LEVELS = ['error', 'fatal', 'critical', 'warning']
     
-    def __init__(self, progress_callback: Callable = None):
+    # Regex für alle Severity-Keywords als ganze Wörter (Word-Boundaries vermeiden
+    # Teilwort-Matches) - einmal pro Klasse kompiliert und von allen Instanzen genutzt
+    SEVERITY_PATTERN = re.compile(r'\b(?:' + '|'.join(SEVERITY_LEVELS) + r')\b')
+    
+    def __init__(self, progress_callback: Callable = None,
+                 file_progress_callback: Callable[[int, int], None] = None,
+                 cancel_event: threading.Event = None,
+                 pool: Optional[ParsePool] = None):
         """
         Initialisiert den LogParser
         
         Args:
             progress_callback: Callback-Funktion für Fortschrittsmeldungen
+            file_progress_callback: Callback (fertige Dateien, Dateien gesamt) nach jeder
+                Datei bzw. jedem ZIP-Archiv des aktuellen Verzeichnisses
+            cancel_event: Wenn gesetzt, bricht parse_directory nach der aktuellen Datei
+                ab und liefert die bis dahin gefundenen Ergebnisse
+            pool: ParsePool des Laufs für paralleles Parsen (ohne Pool wird seriell geparst)
         """
         self.progress_callback = progress_callback
+        self.file_progress_callback = file_progress_callback
+        self.cancel_event = cancel_event
+        self.pool = pool
         self.results = []
         self.seen_errors = set()  # Set für bereits gefundene Fehlertexte
         self.skipped_duplicates = 0  # Zähler für übersprungene Duplikate
+        self._files_done = 0
+        self._files_total = 0
+        self._prefetch_queue = deque()  # Noch nicht gestartete Verzeichnisse aus prefetch_directories
+        self._prefetched = {}  # Verzeichnis -> Future der bereits gestarteten Verzeichnisse
+    
+    def prefetch_directories(self, directory_paths: List[str]):
+        """
+        Beginnt, die nächsten Verzeichnisse parallel in Worker-Prozessen zu parsen
+        
+        Da die Duplikaterkennung pro Verzeichnis zurückgesetzt wird, sind die
+        Verzeichnisse voneinander unabhängig. parse_directory liefert für ein
+        vorab gestartetes Verzeichnis dessen Ergebnis und gibt die aufgezeichneten
+        Fortschrittsmeldungen wieder - das Ergebnis ist dasselbe wie beim seriellen Parsen.
+        Es werden höchstens so viele Verzeichnisse vorab geparst, wie der Pool
+        Worker-Prozesse hat, damit nicht alle Ergebnisse gleichzeitig im Speicher liegen.
         
+        Args:
+            directory_paths: Pfade der Verzeichnisse in Verarbeitungs-Reihenfolge
+        """
+        if self.pool is None or not self.pool.available or len(directory_paths) < 2:
+            return
+        
+        self._prefetch_queue.extend(dict.fromkeys(directory_paths))
+        self._start_prefetch()
+    
+    def _start_prefetch(self):
+        """Startet wartende Verzeichnisse, bis pool.max_workers Verzeichnisse vorab in Arbeit sind"""
+        while (self._prefetch_queue and len(self._prefetched) < self.pool.max_workers
+               and self.pool.available and not self._cancelled()):
+            directory_path = self._prefetch_queue.popleft()
+            if directory_path in self._prefetched:
+                continue
+            try:
+                self._prefetched[directory_path] = self.pool.submit(_parse_directory_worker, directory_path)
+            except BrokenProcessPool:
+                self._prefetch_queue.clear()
+    
     def parse_directory(self, directory_path: str) -> List[Tuple[str, str, str]]:
         """
         Durchsucht ein Verzeichnis rekursiv nach Logfiles
         
+        Statt eines Verzeichnisses kann auch ein ZIP-Archiv angegeben werden,
+        dessen Einträge dann direkt aus dem Archiv gelesen werden.
+        
         Args:
-            directory_path: Pfad zum Verzeichnis
+            directory_path: Pfad zum Verzeichnis (oder ZIP-Archiv)
             
         Returns:
             Liste von Tupeln (Logfilename, Severity, Eintragstext)
         """
+        future = self._prefetched.pop(directory_path, None)
+        if future is not None:
+            results = self._take_prefetched(future)
+            if results is not None:
+                return results
+        elif directory_path in self._prefetch_queue:
+            # Wird jetzt direkt geparst
+            self._prefetch_queue.remove(directory_path)
+        
         self.results = []
         self.seen_errors = set()
         self.skipped_duplicates = 0
@@ -133,20 +717,115 @@ class LogParser:
         if not directory.exists():
             raise ValueError(f"Verzeichnis nicht gefunden: {directory_path}")
         
-        # Durchsuche alle .txt und .zip Dateien rekursiv
-        txt_files = list(directory.rglob('*.txt'))
-        zip_files = list(directory.rglob('*.zip'))
+        # Durchsuche alle .txt und .zip Dateien rekursiv (ein gemeinsamer Durchlauf)
+        found_files = find_files(directory, ('.txt', '.zip'))
+        txt_files = found_files['.txt']
+        zip_files = found_files['.zip']
+        self._files_done = 0
+        self._files_total = len(txt_files) + len(zip_files)
         
-        # Verarbeite .txt Dateien
-        for txt_file in txt_files:
-            self._parse_file(txt_file)
+        # ZIP-Archive werden bereits im Hintergrund entpackt, während die
+        # .txt Dateien geparst werden
+        prefetcher = _ZipEntryPrefetcher(zip_files).start() if zip_files else None
         
-        # Verarbeite .zip Dateien
-        for zip_file in zip_files:
-            self._parse_zip_file(zip_file)
+        try:
+            # Verarbeite .txt Dateien
+            if self.pool is not None and self.pool.worth_parallel(txt_files):
+                self._parse_files_parallel(txt_files)
+            else:
+                for txt_file in txt_files:
+                    if self._cancelled():
+                        break
+                    self._parse_file(txt_file)
+                    self._file_done()
+            
+            # Verarbeite .zip Dateien (in Archiv-Reihenfolge)
+            if prefetcher and not self._cancelled():
+                self._parse_zip_entries(prefetcher)
+        finally:
+            if prefetcher:
+                prefetcher.close()
+        
+        return self.results
+    
+    def _take_prefetched(self, future) -> Optional[List[Tuple[str, str, str]]]:
+        """
+        Übernimmt das Ergebnis eines in prefetch_directories gestarteten Verzeichnisses
+        
+        Args:
+            future: Future von _parse_directory_worker
+            
+        Returns:
+            Liste von Tupeln (Logfilename, Severity, Eintragstext), oder None wenn ein
+            Worker-Prozess abgestürzt ist und das Verzeichnis seriell geparst werden muss
+        """
+        # Das nächste Verzeichnis beginnt, während auf dieses gewartet wird
+        self._start_prefetch()
+        
+        try:
+            # Fehler des Workers (z.B. Verzeichnis nicht gefunden) werden hier weitergegeben
+            results, skipped, events = self.pool.result(future, self._cancelled)
+        except BrokenProcessPool:
+            self._prefetched.clear()
+            self._prefetch_queue.clear()
+            if self.progress_callback:
+                self.progress_callback("Worker-Prozess abgestürzt - parse seriell weiter")
+            return None
+        
+        self.results, self.skipped_duplicates = results, skipped
+        self.seen_errors = set()
+        
+        for event in events:
+            if isinstance(event, str):
+                if self.progress_callback:
+                    self.progress_callback(event)
+            elif self.file_progress_callback:
+                self.file_progress_callback(*event)
         
         return self.results
     
+    def _cancelled(self) -> bool:
+        """Prüft, ob das Parsen über cancel_event abgebrochen wurde"""
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
+    def _file_done(self):
+        """Meldet eine fertig geparste Datei (bzw. ein ZIP-Archiv) an file_progress_callback"""
+        self._files_done += 1
+        if self.file_progress_callback:
+            self.file_progress_callback(self._files_done, self._files_total)
+    
+    def _parse_files_parallel(self, file_paths: List[Path]):
+        """
+        Parst mehrere Logfiles in Worker-Prozessen
+        
+        Die Ergebnisse werden in Datei-Reihenfolge übernommen, sodass Duplikate
+        und Fortschrittsmeldungen genauso behandelt werden wie beim seriellen Parsen.
+        
+        Args:
+            file_paths: Pfade zu den Logfiles
+        """
+        file_results = self.pool.map(_parse_file_worker, file_paths, self.progress_callback)
+        try:
+            for file_path, (errors, skipped, error) in zip(file_paths, file_results):
+                if self._cancelled():
+                    break
+                
+                if self.progress_callback:
+                    self.progress_callback(f"Verarbeite: {file_path.name}")
+                
+                source_name = sys.intern(str(file_path))
+                for severity, generalized_line in errors:
+                    self._add_error(source_name, severity, generalized_line, file_path.name)
+                self.skipped_duplicates += skipped
+                
+                if error is not None and self.progress_callback:
+                    self.progress_callback(f"Fehler beim Lesen von {file_path.name}: {error}")
+                
+                self._file_done()
+        finally:
+            # Storniert noch nicht gestartete Dateien (z.B. nach einem Abbruch)
+            file_results.close()
+    
     def _parse_file(self, file_path: Path):
         """
         Parst eine einzelne Logfile
@@ -158,96 +837,146 @@ class LogParser:
             self.progress_callback(f"Verarbeite: {file_path.name}")
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Prüfe auf Severity-Level
-                    severity = self._detect_severity(line)
-                    if severity:
-                        # Generalisiere Pfade für Duplikaterkennung UND Export
-                        generalized_line = generalize_file_paths(line)
-                        
-                        # Prüfe ob dieser Fehler bereits gefunden wurde (basierend auf generalisierter Version)
-                        if generalized_line not in self.seen_errors:
-                            self.seen_errors.add(generalized_line)
-                            self.results.append((
-                                str(file_path),
-                                severity,
-                                generalized_line  # Speichere generalisierte Zeile für CSV Export
-                            ))
-                            
-                            if self.progress_callback:
-                                self.progress_callback(
-                                    f"Fehler gefunden in {file_path.name}: {severity.upper()}"
-                                )
-                        else:
-                            self.skipped_duplicates += 1
+            self._read_file(file_path)
         
         except Exception as e:
             if self.progress_callback:
                 self.progress_callback(f"Fehler beim Lesen von {file_path.name}: {str(e)}")
     
-    def _parse_zip_file(self, zip_path: Path):
+    def _read_file(self, file_path: Path):
         """
-        Extrahiert und parst Logfiles aus einem ZIP-Archiv
+        Liest eine Logfile und übernimmt die gefundenen Fehler
+        
+        Lesefehler werden an den Aufrufer weitergegeben.
+        
+        Args:
+            file_path: Pfad zur Logfile
+        """
+        # Ein gemeinsames String-Objekt für alle Ergebnis-Tupel dieser Datei
+        source_name = sys.intern(str(file_path))
+        display_name = file_path.name
+        process_line = self._process_line
+        
+        # Binär und blockweise lesen: Zeilen ohne Severity-Keyword werden schon
+        # auf Byte-Ebene verworfen und müssen gar nicht erst dekodiert werden
+        with open(file_path, 'rb') as f:
+            for block in _read_line_blocks(f):
+                for raw in _iter_severity_lines(block):
+                    # splitlines() trennt wie der Textmodus an \r, \n und \r\n
+                    for raw_line in raw.splitlines():
+                        line = raw_line.decode('utf-8', errors='ignore').strip()
+                        if line:
+                            process_line(line, source_name, display_name)
+    
+    def _parse_zip_entries(self, prefetcher: _ZipEntryPrefetcher):
+        """
+        Parst die vom Hintergrund-Thread gelesenen Einträge aus ZIP-Archiven
+        
+        Args:
+            prefetcher: Gestarteter _ZipEntryPrefetcher
+        """
+        zip_started = False
+        for kind, zip_path, txt_file, payload in prefetcher:
+            if self._cancelled():
+                return
+            
+            if kind == 'zip':
+                # Jedes Archiv beginnt mit 'zip' - damit ist das vorherige fertig
+                if zip_started:
+                    self._file_done()
+                zip_started = True
+                if self.progress_callback:
+                    self.progress_callback(f"Extrahiere ZIP: {zip_path.name}")
+            
+            elif kind == 'zip_error':
+                if self.progress_callback:
+                    self.progress_callback(f"Fehler beim Öffnen von ZIP {zip_path.name}: {str(payload)}")
+            
+            elif kind == 'entry_error':
+                if self.progress_callback:
+                    self.progress_callback(
+                        f"Fehler beim Lesen von {txt_file} aus ZIP: {str(payload)}"
+                    )
+            
+            else:
+                try:
+                    self._parse_zip_block(zip_path, txt_file, payload)
+                except Exception as e:
+                    if self.progress_callback:
+                        self.progress_callback(
+                            f"Fehler beim Lesen von {txt_file} aus ZIP: {str(e)}"
+                        )
+        
+        if zip_started:
+            self._file_done()
+    
+    def _parse_zip_block(self, zip_path: Path, txt_file: str, data: bytes):
+        """
+        Parst einen Block eines .txt Eintrags aus einem ZIP-Archiv
         
         Args:
             zip_path: Pfad zum ZIP-Archiv
+            txt_file: Name des Eintrags im Archiv
+            data: Entpackte, ganze Zeilen des Eintrags (siehe _read_line_blocks)
         """
-        if self.progress_callback:
-            self.progress_callback(f"Extrahiere ZIP: {zip_path.name}")
+        # Verwende ZIP-Pfad + interner Pfad als Dateiname
+        full_name = sys.intern(f"{zip_path.name}/{txt_file}")
+        process_line = self._process_line
         
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Finde alle .txt Dateien im ZIP
-                txt_files = [f for f in zip_ref.namelist() if f.endswith('.txt')]
-                
-                for txt_file in txt_files:
-                    try:
-                        # Lese Datei direkt aus ZIP
-                        with zip_ref.open(txt_file) as f:
-                            content = f.read().decode('utf-8', errors='ignore')
-                            
-                            for line in content.splitlines():
-                                line = line.strip()
-                                if not line:
-                                    continue
-                                
-                                severity = self._detect_severity(line)
-                                if severity:
-                                    # Generalisiere Pfade für Duplikaterkennung UND Export
-                                    generalized_line = generalize_file_paths(line)
-                                    
-                                    # Prüfe ob dieser Fehler bereits gefunden wurde (basierend auf generalisierter Version)
-                                    if generalized_line not in self.seen_errors:
-                                        self.seen_errors.add(generalized_line)
-                                        # Verwende ZIP-Pfad + interner Pfad als Dateiname
-                                        full_name = f"{zip_path.name}/{txt_file}"
-                                        self.results.append((
-                                            full_name,
-                                            severity,
-                                            generalized_line  # Speichere generalisierte Zeile für CSV Export
-                                        ))
-                                        
-                                        if self.progress_callback:
-                                            self.progress_callback(
-                                                f"Fehler gefunden in {full_name}: {severity.upper()}"
-                                            )
-                                    else:
-                                        self.skipped_duplicates += 1
-                    
-                    except Exception as e:
-                        if self.progress_callback:
-                            self.progress_callback(
-                                f"Fehler beim Lesen von {txt_file} aus ZIP: {str(e)}"
-                            )
+        for raw in (part for line in _iter_severity_lines(data) for part in line.splitlines()):
+            # Zeilen ohne Severity-Keyword vor dem Dekodieren verwerfen
+            # (die Vorauswahl oben arbeitet nur auf \n-getrennten Zeilen)
+            raw_lower = raw.lower()
+            if (b'error' not in raw_lower and b'fatal' not in raw_lower and
+                    b'critical' not in raw_lower and b'warning' not in raw_lower):
+                continue
+            
+            # str.splitlines() kennt weitere Zeilentrenner (z.B. \x0b, \x1c, \u2028)
+            for line in raw.decode('utf-8', errors='ignore').splitlines():
+                line = line.strip()
+                if line:
+                    process_line(line, full_name, full_name)
+    
+    def _process_line(self, line: str, source_name: str, display_name: str):
+        """
+        Prüft eine Zeile auf Severity-Level und übernimmt neue Fehler in die Ergebnisse
         
-        except Exception as e:
+        Args:
+            line: Bereinigte (gestrippte) Zeile
+            source_name: Dateiname für das Ergebnis-Tupel
+            display_name: Name für Fortschrittsmeldungen
+        """
+        # Prüfe auf Severity-Level
+        severity = self._detect_severity(line)
+        if severity:
+            # Generalisiere Pfade für Duplikaterkennung UND Export
+            self._add_error(source_name, severity, generalize_file_paths(line), display_name)
+    
+    def _add_error(self, source_name: str, severity: str, generalized_line: str, display_name: str):
+        """
+        Übernimmt einen Fehler, sofern er noch nicht gefunden wurde
+        
+        Args:
+            source_name: Dateiname für das Ergebnis-Tupel
+            severity: Erkanntes Severity-Level
+            generalized_line: Zeile mit generalisierten Pfaden
+            display_name: Name für Fortschrittsmeldungen
+        """
+        # Prüfe ob dieser Fehler bereits gefunden wurde (basierend auf generalisierter Version)
+        if generalized_line not in self.seen_errors:
+            self.seen_errors.add(generalized_line)
+            self.results.append((
+                source_name,
+                severity,
+                generalized_line  # Speichere generalisierte Zeile für CSV Export
+            ))
+            
             if self.progress_callback:
-                self.progress_callback(f"Fehler beim Öffnen von ZIP {zip_path.name}: {str(e)}")
+                self.progress_callback(
+                    f"Fehler gefunden in {display_name}: {severity.upper()}"
+                )
+        else:
+            self.skipped_duplicates += 1
     
     def _detect_severity(self, line: str) -> str:
         """
@@ -259,13 +988,14 @@ class LogParser:
         Returns:
             Severity-Level oder None
         """
-        line_lower = line.lower()
+        # Ein Durchlauf findet alle Severity-Keywords der Zeile
+        found = self.SEVERITY_PATTERN.findall(line.lower())
+        if not found:
+            return None
         
+        # Bei mehreren Keywords entscheidet die Reihenfolge in SEVERITY_LEVELS
         for severity in self.SEVERITY_LEVELS:
-            # Suche nach dem Severity-Keyword (case-insensitive)
-            # Verwendet Word-Boundaries um Teilwort-Matches zu vermeiden
-            pattern = r'\b' + severity + r'\b'
-            if re.search(pattern, line_lower):
+            if severity in found:
                 return severity
         
         return None
@@ -3,28 +3,94 @@ Summary Exporter - Erstellt zusammengefasste Berichte und Statistiken
 """
 
 import csv
+import os
 import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Tuple, Dict
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import Counter
 from datetime import datetime
 from .error_categorizer import ErrorCategorizer
 
 
+# Split-Suffixe von Logfile-Namen (z.B. playback-1.log, playback-WRITEABLE.log)
+_SPLIT_SUFFIX_RE = re.compile(r'-\d+\.log$')
+_WRITEABLE_SUFFIX_RE = re.compile(r'-WRITEABLE\.log$')
+
+# Anzahl-Präfix in Descriptions (z.B. "7x 'End of file'")
+_COUNT_PREFIX_RE = re.compile(r'^(\d+)x\s+(.+)$')
+
+_CATEGORIZER = ErrorCategorizer()
+
+
+@lru_cache(maxsize=1 << 16)
+def _classify(text: str, log_type: str) -> Tuple[str, str]:
+    """
+    Kategorie und Kurz-Typ eines Fehlers
+    
+    Viele Zeilen teilen sich Description und Type - das Ergebnis wird über
+    alle Exporte hinweg zwischengespeichert.
+    
+    Args:
+        text: Fehlerbeschreibung
+        log_type: Type/Source des Eintrags
+        
+    Returns:
+        Tupel (Kategorie, Kurz-Typ)
+    """
+    return _CATEGORIZER.categorize(text, log_type), _CATEGORIZER.get_short_type(text)
+
+
+class ErrorGroup:
+    """Kennzahlen einer Fehlergruppe (Kategorie + Kurz-Typ) der gruppierten CSV"""
+    
+    __slots__ = ('entries', 'total_occurrences', 'severity', 'first_occurrence',
+                 'last_occurrence', 'logfiles', 'description')
+    
+    def __init__(self, first_occurrence: Tuple[str, str], description: str):
+        self.entries = 0
+        self.total_occurrences = 0  # Summe aller Counts inkl. "7x similar"
+        self.severity = ''
+        self.first_occurrence = first_occurrence  # (Datum, Zeit), erst beim Schreiben formatiert
+        self.last_occurrence = first_occurrence
+        self.logfiles = Counter()  # Count pro Logfile-Gruppe
+        self.description = description
+
+
+@dataclass
+class SummaryAggregate:
+    """Kennzahlen für gruppierte CSV und Statistik aus einem Durchlauf über die Ergebnisse"""
+    
+    # Gruppierte CSV - Schlüssel "Kategorie|Kurz-Typ"
+    groups: Dict[str, ErrorGroup] = field(default_factory=dict)
+    
+    # Statistik
+    total_errors: int = 0
+    total_occurrences: int = 0
+    categories: Counter = field(default_factory=Counter)
+    severities: Counter = field(default_factory=Counter)
+    logfile_groups: Counter = field(default_factory=Counter)
+    error_types: Counter = field(default_factory=Counter)
+
+
 class SummaryExporter:
     """Erstellt zusammengefasste Berichte aus Log-Parsing-Ergebnissen"""
     
     @staticmethod
     def _normalize_filename(filename: str) -> str:
         """Entfernt Split-Suffixe aus Dateinamen"""
-        normalized = re.sub(r'-\d+\.log$', '.log', filename)
-        normalized = re.sub(r'-WRITEABLE\.log$', '.log', normalized)
+        normalized = _SPLIT_SUFFIX_RE.sub('.log', filename)
+        normalized = _WRITEABLE_SUFFIX_RE.sub('.log', normalized)
         return normalized
     
     @staticmethod
     def _extract_count_from_description(description: str) -> Tuple[int, str]:
         """Extrahiert Anzahl aus Description"""
-        match = re.match(r'^(\d+)x\s+(.+)$', description)
+        # Die meisten Descriptions haben kein Anzahl-Präfix - Regex nur wenn sie mit einer Ziffer beginnen
+        if not description[:1].isdigit():
+            return 1, description
+        match = _COUNT_PREFIX_RE.match(description)
         if match:
             count = int(match.group(1))
             clean_desc = match.group(2).strip("'\"")
@@ -32,66 +98,107 @@ class SummaryExporter:
         return 1, description
     
     @staticmethod
-    def export_grouped_csv(results: List[Tuple], output_path: str, anonymizer=None):
+    def aggregate(results: List[Tuple]) -> SummaryAggregate:
         """
-        Exportiert gruppierte/zusammengefasste Fehler mit Logfile-Gruppierung
+        Berechnet alle Kennzahlen für gruppierte CSV und Statistik in einem Durchlauf
+        
+        Das Ergebnis kann an export_grouped_csv und export_statistics übergeben
+        werden, damit die Ergebnisse nicht für jeden Export erneut
+        kategorisiert und gezählt werden.
         
         Args:
             results: Liste von Tupeln (Logfilename, Datum, Zeit, Severity, Type, Description)
-            output_path: Pfad zur Ausgabe-CSV-Datei
-            anonymizer: Optionaler DataAnonymizer für Anonymisierung
+            
+        Returns:
+            SummaryAggregate mit allen Kennzahlen
         """
-        output_file = Path(output_path)
+        summary = SummaryAggregate(total_errors=len(results))
         
-        # Gruppiere Fehler nach Kategorie + Kurz-Typ + Logfile-Gruppe
-        grouped_errors = defaultdict(lambda: {
-            'count': 0,
-            'total_occurrences': 0,  # Summe aller Counts inkl. "7x similar"
-            'severity': '',
-            'first_occurrence': '',
-            'last_occurrence': '',
-            'logfile_groups': Counter(),  # Count pro Logfile-Gruppe
-            'full_description': '',
-            'category': ''
-        })
-        
-        categorizer = ErrorCategorizer()
+        classify = _classify  # Lokal gebunden für die Schleife
+        # Ein Logfile liefert viele Zeilen - Dateinamen nur einmal normalisieren
+        normalized_filenames = {}
+        
+        # Gruppen einmal binden statt pro Zeile über das Aggregat nachzuschlagen
+        groups = summary.groups
+        total_occurrences = 0
+        
+        # Statistik-Zähler pro Zeile nur nach Rohwerten summieren und erst am Ende
+        # auf Kategorie, Kurz-Typ, Severity und Logfile-Gruppe verteilen
+        # (Reihenfolge des ersten Auftretens bleibt dabei erhalten)
+        description_counts = Counter()
+        severity_counts = Counter()
+        logfile_counts = Counter()
         
         for logfile, date, time, severity, log_type, description in results:
-            # Kategorisiere Fehler
-            category = categorizer.categorize(description, log_type)
-            short_type = categorizer.get_short_type(description)
-            
             # Extrahiere Anzahl aus Description
             count, clean_desc = SummaryExporter._extract_count_from_description(description)
             
             # Normalisiere Dateinamen
-            filename = Path(logfile).name
-            normalized_filename = SummaryExporter._normalize_filename(filename)
+            normalized_filename = normalized_filenames.get(logfile)
+            if normalized_filename is None:
+                normalized_filename = SummaryExporter._normalize_filename(os.path.basename(logfile))
+                normalized_filenames[logfile] = normalized_filename
             
-            # Verwende Kategorie + Short-Type als Schlüssel
+            # --- Gruppierte CSV: Kategorie + Short-Type der vollständigen Description ---
+            category, short_type = classify(description, log_type)
             key = f"{category}|{short_type}"
             
-            grouped_errors[key]['count'] += 1
-            grouped_errors[key]['total_occurrences'] += count
-            grouped_errors[key]['severity'] = severity
-            grouped_errors[key]['category'] = category
+            occurrence = (date, time)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = ErrorGroup(occurrence, clean_desc)
             
-            # Zeitstempel
-            occurrence = f"{date} {time}"
-            if not grouped_errors[key]['first_occurrence']:
-                grouped_errors[key]['first_occurrence'] = occurrence
-            grouped_errors[key]['last_occurrence'] = occurrence
+            group.entries += 1
+            group.total_occurrences += count
+            group.severity = severity
+            group.last_occurrence = occurrence
             
             # Logfile-Gruppen sammeln
-            grouped_errors[key]['logfile_groups'][normalized_filename] += count
+            group.logfiles[normalized_filename] += count
             
             # Behalte erste vollständige Description
-            if not grouped_errors[key]['full_description']:
-                grouped_errors[key]['full_description'] = clean_desc
+            if not group.description:
+                group.description = clean_desc
+            
+            # --- Statistik ---
+            total_occurrences += count
+            description_counts[(clean_desc, log_type)] += count
+            severity_counts[severity] += count
+            logfile_counts[logfile] += count
+        
+        summary.total_occurrences = total_occurrences
+        
+        # Statistik: Kategorie + Short-Type der bereinigten Description
+        for (clean_desc, log_type), count in description_counts.items():
+            category, short_type = classify(clean_desc, log_type)
+            summary.categories[category] += count
+            summary.error_types[short_type] += count
+        for severity, count in severity_counts.items():
+            summary.severities[severity.upper()] += count
+        for logfile, count in logfile_counts.items():
+            summary.logfile_groups[normalized_filenames[logfile]] += count
+        return summary
+    
+    @staticmethod
+    def export_grouped_csv(results: List[Tuple], output_path: str, anonymizer=None,
+                           summary: SummaryAggregate = None):
+        """
+        Exportiert gruppierte/zusammengefasste Fehler mit Logfile-Gruppierung
+        
+        Args:
+            results: Liste von Tupeln (Logfilename, Datum, Zeit, Severity, Type, Description)
+            output_path: Pfad zur Ausgabe-CSV-Datei
+            anonymizer: Optionaler DataAnonymizer für Anonymisierung
+            summary: Bereits berechnete Kennzahlen (siehe aggregate), sonst werden sie hier berechnet
+        """
+        output_file = Path(output_path)
+        
+        # Gruppiere Fehler nach Kategorie + Kurz-Typ + Logfile-Gruppe
+        if summary is None:
+            summary = SummaryExporter.aggregate(results)
         
         # Schreibe gruppierte CSV
-        with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+        with open(output_file, 'w', newline='', encoding='utf-8-sig', buffering=1 << 20) as f:
             writer = csv.writer(f, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
             
             # Header
@@ -108,37 +215,43 @@ class SummaryExporter:
                 'Beispiel-Beschreibung'
             ])
             
-            # Sortiere nach Gesamt-Vorkommen (häufigste zuerst)
-            sorted_errors = sorted(
-                grouped_errors.items(),
-                key=lambda x: x[1]['total_occurrences'],
-                reverse=True
+            # Sortiere nach Gesamt-Vorkommen (häufigste zuerst, sonst in Fund-Reihenfolge)
+            sorted_groups = sorted(summary.groups.items(),
+                                   key=lambda item: item[1].total_occurrences, reverse=True)
+            writer.writerows(
+                SummaryExporter._grouped_row(key, group)
+                for key, group in sorted_groups
             )
-            
-            for key, data in sorted_errors:
-                category, short_type = key.split('|', 1)
-                
-                description = data['full_description']
-                
-                # Top 3 Logfiles mit höchsten Counts
-                top_logfiles = data['logfile_groups'].most_common(3)
-                top_logfiles_str = ', '.join([f"{lf} ({cnt})" for lf, cnt in top_logfiles])
-                
-                writer.writerow([
-                    category,
-                    short_type,
-                    data['count'],
-                    data['total_occurrences'],
-                    data['severity'],
-                    data['first_occurrence'],
-                    data['last_occurrence'],
-                    len(data['logfile_groups']),
-                    top_logfiles_str[:150],  # Max 150 Zeichen
-                    description[:200]  # Max 200 Zeichen
-                ])
     
     @staticmethod
-    def export_statistics(results: List[Tuple], output_path: str, anonymizer=None):
+    def _grouped_row(key: str, group: ErrorGroup) -> list:
+        """Baut eine Zeile der gruppierten CSV für eine Fehlergruppe"""
+        category, short_type = key.split('|', 1)
+        
+        description = group.description
+        first_date, first_time = group.first_occurrence
+        last_date, last_time = group.last_occurrence
+        
+        # Top 3 Logfiles mit höchsten Counts
+        top_logfiles = group.logfiles.most_common(3)
+        top_logfiles_str = ', '.join([f"{lf} ({cnt})" for lf, cnt in top_logfiles])
+        
+        return [
+            category,
+            short_type,
+            group.entries,
+            group.total_occurrences,
+            group.severity,
+            f"{first_date} {first_time}",
+            f"{last_date} {last_time}",
+            len(group.logfiles),
+            top_logfiles_str[:150],  # Max 150 Zeichen
+            description[:200]  # Max 200 Zeichen
+        ]
+    
+    @staticmethod
+    def export_statistics(results: List[Tuple], output_path: str, anonymizer=None,
+                          summary: SummaryAggregate = None):
         """
         Erstellt eine Statistik-Textdatei
         
@@ -146,80 +259,65 @@ class SummaryExporter:
             results: Liste von Tupeln (Logfilename, Datum, Zeit, Severity, Type, Description)
             output_path: Pfad zur Ausgabe-Textdatei
             anonymizer: Optionaler DataAnonymizer für Anonymisierung
+            summary: Bereits berechnete Kennzahlen (siehe aggregate), sonst werden sie hier berechnet
         """
         output_file = Path(output_path)
         
         # Sammle Statistiken
-        total_errors = len(results)
-        categories = Counter()
-        severities = Counter()
-        logfile_groups = Counter()
-        total_occurrences = 0
-        categorizer = ErrorCategorizer()
+        if summary is None:
+            summary = SummaryExporter.aggregate(results)
+        total_errors = summary.total_errors
+        total_occurrences = summary.total_occurrences
+        categories = summary.categories
+        severities = summary.severities
+        logfile_groups = summary.logfile_groups
+        error_types = summary.error_types
         
-        for logfile, date, time, severity, log_type, description in results:
-            # Extrahiere Anzahl
-            count, clean_desc = SummaryExporter._extract_count_from_description(description)
-            total_occurrences += count
-            
-            category = categorizer.categorize(clean_desc, log_type)
-            categories[category] += count
-            severities[severity.upper()] += count
-            
-            # Normalisiere Dateinamen für Gruppierung
-            filename = Path(logfile).name
-            normalized = SummaryExporter._normalize_filename(filename)
-            logfile_groups[normalized] += count
+        def percentage(count: int) -> float:
+            return (count / total_occurrences * 100) if total_occurrences > 0 else 0
+        
+        # Baue Statistik als Zeilenliste auf und schreibe sie in einem Stück
+        lines = [
+            "=" * 80,
+            "LOG ANALYSE STATISTIK",
+            "=" * 80,
+            f"Generiert: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "",
+            f"Unique Fehlereinträge: {total_errors:,}",
+            f"Gesamt-Vorkommen (inkl. Counts): {total_occurrences:,}",
+            f"Unique Logfile-Gruppen: {len(logfile_groups)}",
+        ]
+        
+        # Fehler nach Kategorie
+        lines += ["", "-" * 80, "FEHLER NACH KATEGORIE", "-" * 80]
+        lines.extend(
+            f"{category:20s}: {count:6,} ({percentage(count):5.1f}%)"
+            for category, count in categories.most_common()
+        )
+        
+        # Fehler nach Severity
+        lines += ["", "-" * 80, "FEHLER NACH SEVERITY", "-" * 80]
+        lines.extend(
+            f"{severity:20s}: {count:6,} ({percentage(count):5.1f}%)"
+            for severity, count in severities.most_common()
+        )
+        
+        # Top 10 betroffene Logfile-Gruppen
+        lines += ["", "-" * 80, "TOP 10 BETROFFENE LOGFILE-GRUPPEN", "-" * 80]
+        for filename, count in logfile_groups.most_common(10):
+            # Anonymisiere Dateinamen wenn gewünscht
+            display_name = anonymizer.anonymize_filename(filename) if anonymizer else filename
+            lines.append(f"{display_name:40s}: {count:6,} ({percentage(count):5.1f}%)")
+        
+        # Top 10 häufigste Fehlertypen
+        lines += ["", "-" * 80, "TOP 10 HÄUFIGSTE FEHLERTYPEN", "-" * 80]
+        lines.extend(
+            f"{count:6,} ({percentage(count):5.1f}%) - {error_type}"
+            for error_type, count in error_types.most_common(10)
+        )
+        
+        lines += ["", "=" * 80]
         
         # Schreibe Statistik
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("LOG ANALYSE STATISTIK\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Generiert: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"\nUnique Fehlereinträge: {total_errors:,}\n")
-            f.write(f"Gesamt-Vorkommen (inkl. Counts): {total_occurrences:,}\n")
-            f.write(f"Unique Logfile-Gruppen: {len(logfile_groups)}\n")
-            
-            # Fehler nach Kategorie
-            f.write("\n" + "-" * 80 + "\n")
-            f.write("FEHLER NACH KATEGORIE\n")
-            f.write("-" * 80 + "\n")
-            for category, count in categories.most_common():
-                percentage = (count / total_occurrences * 100) if total_occurrences > 0 else 0
-                f.write(f"{category:20s}: {count:6,} ({percentage:5.1f}%)\n")
-            
-            # Fehler nach Severity
-            f.write("\n" + "-" * 80 + "\n")
-            f.write("FEHLER NACH SEVERITY\n")
-            f.write("-" * 80 + "\n")
-            for severity, count in severities.most_common():
-                percentage = (count / total_occurrences * 100) if total_occurrences > 0 else 0
-                f.write(f"{severity:20s}: {count:6,} ({percentage:5.1f}%)\n")
-            
-            # Top 10 betroffene Logfile-Gruppen
-            f.write("\n" + "-" * 80 + "\n")
-            f.write("TOP 10 BETROFFENE LOGFILE-GRUPPEN\n")
-            f.write("-" * 80 + "\n")
-            for filename, count in logfile_groups.most_common(10):
-                percentage = (count / total_occurrences * 100) if total_occurrences > 0 else 0
-                # Anonymisiere Dateinamen wenn gewünscht
-                display_name = anonymizer.anonymize_filename(filename) if anonymizer else filename
-                f.write(f"{display_name:40s}: {count:6,} ({percentage:5.1f}%)\n")
-            
-            # Top 10 häufigste Fehlertypen
-            f.write("\n" + "-" * 80 + "\n")
-            f.write("TOP 10 HÄUFIGSTE FEHLERTYPEN\n")
-            f.write("-" * 80 + "\n")
-            
-            error_types = Counter()
-            for logfile, date, time, severity, log_type, description in results:
-                count, clean_desc = SummaryExporter._extract_count_from_description(description)
-                short_type = categorizer.get_short_type(clean_desc)
-                error_types[short_type] += count
-            
-            for error_type, count in error_types.most_common(10):
-                percentage = (count / total_occurrences * 100) if total_occurrences > 0 else 0
-                f.write(f"{count:6,} ({percentage:5.1f}%) - {error_type}\n")
-            
-            f.write("\n" + "=" * 80 + "\n")
+            f.write("\n".join(lines) + "\n")
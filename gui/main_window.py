@@ -4,21 +4,29 @@ Main Window - GUI für den LogfileParser
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import os
 import threading
+from collections import deque
+from contextlib import ExitStack
 from pathlib import Path
 from datetime import datetime
-import zipfile
+from time import localtime
 import tempfile
 import shutil
-from core import LogParser, CSVExporter
-from core.avstumpfl_parser import AVStumpflLogParser
-from core.avstumpfl_exporter import AVStumpflCSVExporter
-from core.summary_exporter import SummaryExporter
 
 
 class LogParserApp:
     """Main window for the LogfileParser application"""
     
+    # Maximum number of lines kept in the log widget (the full log is written to the log file)
+    LOG_MAX_LINES = 1000
+    
+    # Keys that don't modify the read-only log widget (navigation, selection, copy)
+    LOG_READONLY_KEYS = frozenset((
+        'Left', 'Right', 'Up', 'Down', 'Home', 'End', 'Prior', 'Next',
+        'Shift_L', 'Shift_R', 'Control_L', 'Control_R',
+    ))
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("LogfileParser")
@@ -26,14 +34,29 @@ class LogParserApp:
         self.root.minsize(950, 1050)  # Minimum size to fit all UI elements
         
         self.directories = []
+        self._dir_set = set()  # Same entries as self.directories, for fast membership checks
         self.is_parsing = False
+        self._cancel_event = threading.Event()  # Lets the parser stop after the current file
         self.parser = None
         self.parser_mode = tk.StringVar(value="avstumpfl")  # Default: AV Stumpfl Format
-        self.temp_dirs = []  # Temporary directories for extracted ZIP files
-        self.custom_temp_dir = None  # User-defined temp folder for ZIP extraction
         
-        # Cleanup old temp directories on startup
-        self._cleanup_old_temp_dirs()
+        # Log messages are queued (from any thread) and flushed to the log file and the Text widget in batches
+        self._log_queue = deque()
+        self._log_file = None  # Full log of the current parsing run, see _start_parsing
+        
+        # Latest (unique, skipped) counts from the parser thread, shown by _flush_log
+        self._pending_stats = (0, 0)
+        self._shown_stats = (0, 0)
+        self._progress_percent = 0  # Written by the parser thread, shown by _flush_log
+        self._shown_percent = 0
+        self._ui_visible = True  # False while the window is minimized
+        # Lines waiting for the log widget (only the newest fit, one line is left for the
+        # "suppressed" notice), used by the Tk thread only
+        self._display_lines = deque(maxlen=self.LOG_MAX_LINES - 1)
+        self._suppressed_count = 0  # Lines dropped from _display_lines since the last widget update
+        
+        # Delete ZIP extraction folders left behind by older versions (in the background, so the window is not held up)
+        threading.Thread(target=self._cleanup_old_temp_dirs, daemon=True).start()
         
         # Export options
         self.export_detailed = tk.BooleanVar(value=True)
@@ -49,7 +72,6 @@ class LogParserApp:
         # Collapsible section states
         self.export_options_expanded = tk.BooleanVar(value=False)
         self.database_expanded = tk.BooleanVar(value=False)
-        self.temp_dir_expanded = tk.BooleanVar(value=False)
         self.output_file_expanded = tk.BooleanVar(value=True)  # Output file visible by default
         
         # Load saved settings (e.g., last database)
@@ -59,6 +81,11 @@ class LogParserApp:
         
         # Update UI with loaded settings
         self._update_ui_from_settings()
+        
+        # Periodically write queued log messages to the log widget
+        self.root.bind("<Map>", self._on_map_change)
+        self.root.bind("<Unmap>", self._on_map_change)
+        self._flush_log()
     
     def _create_collapsible_frame(self, parent, title, var_expanded):
         """Creates a collapsible frame with expand/collapse functionality"""
@@ -176,12 +203,6 @@ class LogParserApp:
             command=self._clear_directories
         ).pack(side=tk.LEFT, padx=2)
         
-        ttk.Button(
-            btn_frame,
-            text="Clear Cache",
-            command=self._manual_cache_cleanup
-        ).pack(side=tk.LEFT, padx=2)
-        
         # Export Options - COLLAPSIBLE
         export_options_content = self._create_collapsible_frame(
             self.root,
@@ -282,54 +303,6 @@ class LogParserApp:
             wraplength=900
         ).pack(anchor=tk.W, padx=20, pady=(5, 0))
         
-        # ZIP Extraction Temp Folder - COLLAPSIBLE
-        temp_config_content = self._create_collapsible_frame(
-            self.root,
-            "ZIP Extraction Temp Folder",
-            self.temp_dir_expanded
-        )
-        
-        # Info label
-        ttk.Label(
-            temp_config_content,
-            text="Choose a drive with sufficient storage space for temporary ZIP extraction:",
-            font=('Arial', 9)
-        ).pack(anchor=tk.W, pady=(0, 5))
-        
-        # Temp path display and selection
-        temp_path_frame = ttk.Frame(temp_config_content)
-        temp_path_frame.pack(fill=tk.X, pady=2)
-        
-        self.temp_dir_var = tk.StringVar(value="Standard (System Temp)")
-        temp_entry = ttk.Entry(
-            temp_path_frame,
-            textvariable=self.temp_dir_var,
-            state='readonly'
-        )
-        temp_entry.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
-        
-        ttk.Button(
-            temp_path_frame,
-            text="Browse...",
-            command=self._select_temp_directory
-        ).pack(side=tk.LEFT, padx=2)
-        
-        ttk.Button(
-            temp_path_frame,
-            text="Reset",
-            command=self._reset_temp_directory
-        ).pack(side=tk.LEFT, padx=2)
-        
-        # Info about available storage space
-        self.temp_space_label = ttk.Label(
-            temp_config_content,
-            text="",
-            font=('Arial', 8),
-            foreground='gray'
-        )
-        self.temp_space_label.pack(anchor=tk.W, padx=5)
-        self._update_temp_space_info()
-        
         # Output File - COLLAPSIBLE
         output_content = self._create_collapsible_frame(
             self.root,
@@ -340,6 +313,7 @@ class LogParserApp:
         output_inner = ttk.Frame(output_content)
         output_inner.pack(fill=tk.X)
         
+        # Empty until the user picks a file - the default name gets its timestamp when parsing starts
         self.output_path_var = tk.StringVar()
         # Use safe directory: Desktop or Documents, not System32
         safe_dir = Path.home() / "Desktop"
@@ -347,9 +321,7 @@ class LogParserApp:
             safe_dir = Path.home() / "Documents"
         if not safe_dir.exists():
             safe_dir = Path(__file__).parent.parent  # Program directory as fallback
-        
-        default_output = str(safe_dir / f"logparser_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
-        self.output_path_var.set(default_output)
+        self.default_output_dir = safe_dir
         
         ttk.Entry(
             output_inner,
@@ -363,6 +335,13 @@ class LogParserApp:
             command=self._select_output_file
         ).pack(side=tk.RIGHT)
         
+        ttk.Label(
+            output_content,
+            text=f"Default: {safe_dir / 'logparser_results_<date>_<time>.csv'}",
+            font=('Arial', 8),
+            foreground='gray'
+        ).pack(anchor=tk.W, padx=5)
+        
         # Fortschritts-Bereich
         progress_frame = ttk.LabelFrame(self.root, text="Progress", padding="10")
         progress_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -382,7 +361,8 @@ class LogParserApp:
         # Fortschrittsbalken
         self.progress = ttk.Progressbar(
             progress_frame,
-            mode='indeterminate'
+            mode='determinate',
+            maximum=100
         )
         self.progress.pack(fill=tk.X, pady=(0, 5))
         
@@ -397,9 +377,12 @@ class LogParserApp:
             log_frame,
             height=15,
             yscrollcommand=log_scroll.set,
-            state='disabled',
             wrap=tk.WORD
         )
+        # Read-only über Bindings statt state='disabled' - so muss nicht bei jedem Schreiben umgeschaltet werden
+        self.log_text.bind("<Key>", self._block_log_edit)
+        for sequence in ("<Button-2>", "<<Paste>>", "<<Cut>>", "<<Clear>>"):
+            self.log_text.bind(sequence, lambda e: "break")
         self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         log_scroll.config(command=self.log_text.yview)
         
@@ -447,27 +430,16 @@ class LogParserApp:
         ).pack(side=tk.RIGHT, padx=2)
     
     def _add_directory(self):
-        """Adds a directory to the list and automatically finds all ZIP files in it"""
+        """Adds a directory to the list - ZIP files in it are parsed together with the directory"""
         directory = filedialog.askdirectory(title="Select Directory")
         if not directory:
             return
-            
-        directory_path = Path(directory)
         
-        # Add main directory
-        if directory not in self.directories:
+        if directory not in self._dir_set:
+            self._dir_set.add(directory)
             self.directories.append(directory)
             self.dir_listbox.insert(tk.END, directory)
             self._log(f"Directory added: {directory}")
-        
-        # Search recursively for ZIP files
-        zip_files = list(directory_path.rglob("*.zip"))
-        if zip_files:
-            self._log(f"Found ZIP files: {len(zip_files)}")
-            # Show progress dialog and extract ZIPs
-            self._extract_zip_files_with_progress(zip_files)
-        else:
-            self._log("No ZIP files found in directory")
     
     def _add_file(self):
         """Adds a single file (automatic detection if ZIP)"""
@@ -486,160 +458,48 @@ class LogParserApp:
         file_path_obj = Path(file_path)
         
         # Check if ZIP file (robust detection)
+        import zipfile
         is_zip = file_path_obj.suffix.lower() == '.zip' or zipfile.is_zipfile(file_path)
         
         if is_zip:
             self._log(f"ZIP file detected: {file_path_obj.name}")
-            # Show progress dialog for single ZIP
-            self._extract_zip_files_with_progress([Path(file_path)])
+            self._add_zip_files([file_path])
         else:
             self._log(f"Log file detected: {file_path_obj.name}")
             # Add file's directory (so the file will be parsed)
             parent_dir = str(file_path_obj.parent)
-            if parent_dir not in self.directories:
+            if parent_dir not in self._dir_set:
+                self._dir_set.add(parent_dir)
                 self.directories.append(parent_dir)
                 self.dir_listbox.insert(tk.END, f"📄 {file_path_obj.name} → {parent_dir}")
                 self._log(f"File added: {file_path_obj.name}")
     
-    def _extract_zip_files_with_progress(self, zip_files: list):
-        """Extracts multiple ZIP files with progress display"""
-        # Create progress dialog
-        progress_dialog = tk.Toplevel(self.root)
-        progress_dialog.title("Extracting ZIP Files")
-        progress_dialog.geometry("600x200")
-        progress_dialog.transient(self.root)
-        progress_dialog.grab_set()
-        
-        # Prevent closing during extraction
-        extraction_complete = threading.Event()
-        progress_dialog.protocol("WM_DELETE_WINDOW", lambda: None)
-        
-        # Status label
-        status_label = ttk.Label(
-            progress_dialog,
-            text=f"Extracting 0 of {len(zip_files)} ZIP files...",
-            font=('Arial', 10, 'bold')
-        )
-        status_label.pack(pady=(20, 10))
-        
-        # Current filename
-        file_label = ttk.Label(
-            progress_dialog,
-            text="Preparing...",
-            font=('Arial', 9),
-            wraplength=550
-        )
-        file_label.pack(pady=5)
-        
-        # Progress bar
-        progress_bar = ttk.Progressbar(
-            progress_dialog,
-            mode='determinate',
-            length=550,
-            maximum=len(zip_files)
-        )
-        progress_bar.pack(pady=10)
-        
-        # Detail label
-        detail_label = ttk.Label(
-            progress_dialog,
-            text="",
-            font=('Arial', 8),
-            foreground='gray'
-        )
-        detail_label.pack(pady=5)
-        
-        # Extract ZIPs in thread
-        def extract_worker():
-            for idx, zip_file in enumerate(zip_files, 1):
-                try:
-                    zip_path_obj = Path(zip_file)
-                    
-                    # Update UI
-                    self.root.after(0, lambda i=idx, name=zip_path_obj.name: (
-                        status_label.config(text=f"Extracting {i} of {len(zip_files)} ZIP files..."),
-                        file_label.config(text=f"📦 {name}"),
-                        progress_bar.config(value=i-1)
-                    ))
-                    
-                    # Create temporary directory
-                    temp_dir = self._create_temp_dir()
-                    self.temp_dirs.append(temp_dir)
-                    
-                    # Extract ZIP
-                    self.root.after(0, lambda: self._log(f"Extracting ZIP: {zip_path_obj.name}"))
-                    with zipfile.ZipFile(str(zip_file), 'r') as zip_ref:
-                        zip_ref.extractall(temp_dir)
-                    
-                    # Count extracted files
-                    all_files = list(Path(temp_dir).rglob('*'))
-                    log_files = [f for f in all_files if f.suffix.lower() in ['.log', '.txt']]
-                    
-                    # Add to list
-                    self.directories.append(temp_dir)
-                    display_name = f"📦 {zip_path_obj.name} ({len(log_files)} Logs)"
-                    self.root.after(0, lambda dn=display_name: self.dir_listbox.insert(tk.END, dn))
-                    self.root.after(0, lambda lf=len(log_files), af=len(all_files): 
-                                  self._log(f"  └─ Extracted: {lf} log files, {af} files total"))
-                    
-                    # Update details
-                    self.root.after(0, lambda lf=len(log_files): 
-                                  detail_label.config(text=f"✓ {lf} log files found"))
-                    
-                except Exception as e:
-                    error_msg = f"ERROR extracting {Path(zip_file).name}: {str(e)}"
-                    self.root.after(0, lambda msg=error_msg: self._log(msg))
-                    self.root.after(0, lambda: detail_label.config(text="✗ Extraction error", foreground='red'))
+    def _add_zip_files(self, zip_files: list):
+        """Adds ZIP files to the list - their log files are read directly from the archive when parsing"""
+        import zipfile
+        display_names = []
+        for zip_file in zip_files:
+            zip_path = str(zip_file)
+            if zip_path in self._dir_set:
+                continue
+            zip_name = os.path.basename(zip_path)
             
-            # Mark extraction as complete
-            extraction_complete.set()
+            # Only the central directory is read here, nothing is extracted
+            try:
+                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                    names = zip_ref.namelist()
+            except Exception as e:
+                self._log(f"ERROR reading {zip_name}: {str(e)}")
+                continue
+            log_count = sum(1 for name in names if name.lower().endswith(('.log', '.txt')))
             
-            # Close dialog after completion
-            self.root.after(0, progress_dialog.destroy)
-            self.root.after(100, lambda: self._log(f"✓ {len(zip_files)} ZIP files successfully extracted"))
-        
-        # Start thread (NICHT als daemon, damit er zu Ende läuft)
-        thread = threading.Thread(target=extract_worker, daemon=False)
-        thread.start()
+            self._dir_set.add(zip_path)
+            self.directories.append(zip_path)
+            display_names.append(f"📦 {zip_name} ({log_count} Logs)")
+            self._log(f"  └─ ZIP added: {zip_name} ({log_count} log files, {len(names)} entries)")
         
-        # Wait for extraction completion (mit Timeout)
-        def wait_for_extraction():
-            if extraction_complete.wait(timeout=0.1):
-                # Extraction completed
-                return
-            else:
-                # Not finished yet, check again
-                self.root.after(100, wait_for_extraction)
-        
-        wait_for_extraction()
-    
-    def _add_zip_file(self, zip_path: str):
-        """Extracts ZIP file to temporary directory"""
-        try:
-            zip_path_obj = Path(zip_path)
-            
-            # Create temporary directory
-            temp_dir = self._create_temp_dir()
-            self.temp_dirs.append(temp_dir)
-            
-            # Extracting ZIP
-            self._log(f"Extracting ZIP: {zip_path_obj.name}")
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Count extracted files
-            all_files = list(Path(temp_dir).rglob('*'))
-            log_files = [f for f in all_files if f.suffix.lower() in ['.log', '.txt']]
-            
-            # Add temporary directory to list
-            self.directories.append(temp_dir)
-            display_name = f"📦 {zip_path_obj.name} ({len(log_files)} Logs)"
-            self.dir_listbox.insert(tk.END, display_name)
-            self._log(f"  └─ Extracted: {len(log_files)} log files, {len(all_files)} files total")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"ZIP file could not be extracted:\n{str(e)}")
-            self._log(f"ERROR extracting {Path(zip_path).name}: {str(e)}")
+        if display_names:
+            self.dir_listbox.insert(tk.END, *display_names)
     
     def _remove_directory(self):
         """Removes the selected directory"""
@@ -648,24 +508,15 @@ class LogParserApp:
             index = selection[0]
             directory = self.directories[index]
             self.directories.pop(index)
+            self._dir_set.discard(directory)
             self.dir_listbox.delete(index)
             
-            # If it's a temp directory, perform cleanup
-            if directory in self.temp_dirs:
-                self.temp_dirs.remove(directory)
-                try:
-                    if Path(directory).exists():
-                        shutil.rmtree(directory)
-                        self._log(f"Temporary directory deleted: {directory}")
-                except Exception as e:
-                    self._log(f"Warning: Could not delete temporary directory: {e}")
-            
             self._log(f"Directory removed: {directory}")
     
     def _clear_directories(self):
         """Clears the directory list"""
-        self._cleanup_temp_dirs()
         self.directories.clear()
+        self._dir_set.clear()
         self.dir_listbox.delete(0, tk.END)
         self._log("Directory list cleared")
     
@@ -680,22 +531,114 @@ class LogParserApp:
             self.output_path_var.set(filename)
     
     def _log(self, message: str):
-        """Fügt eine Nachricht zum Log hinzu"""
-        self.log_text.config(state='normal')
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        """Fügt eine Nachricht zum Log hinzu (threadsicher, Anzeige erfolgt gesammelt in _flush_log)"""
+        self._log_queue.append(message)
+    
+    def _flush_log(self):
+        """Schreibt wartende Log-Nachrichten, Statistik und Fortschritt ins Fenster und plant den nächsten Durchlauf"""
+        self._write_log_queue()
+        
+        # Statistik und Fortschrittsbalken nur bei Änderung neu setzen
+        stats = self._pending_stats
+        if stats != self._shown_stats:
+            self._shown_stats = stats
+            self.stats_var.set(f"Unique Errors: {stats[0]} | Duplicates Skipped: {stats[1]}")
+        
+        percent = self._progress_percent
+        if percent != self._shown_percent:
+            self._shown_percent = percent
+            self.progress.configure(value=percent)
+        
+        self.root.after(100, self._flush_log)
+    
+    def _write_log_queue(self):
+        """Schreibt alle wartenden Log-Nachrichten in die Log-Datei und die neuesten ins Log-Fenster"""
+        if self._log_queue:
+            # deque.popleft ist threadsicher - Nachrichten, die währenddessen ankommen, folgen im nächsten Durchlauf
+            popleft = self._log_queue.popleft
+            messages = [popleft() for _ in range(len(self._log_queue))]
+            
+            # Ein Zeitstempel pro Durchlauf genügt (Anzeige in Sekunden, Durchlauf alle 100 ms)
+            t = localtime()
+            prefix = f"[{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}] "
+            lines = [prefix + message for message in messages]
+            
+            # Die Log-Datei erhält jede Nachricht
+            if self._log_file:
+                try:
+                    self._log_file.write("\n".join(lines) + "\n")
+                except OSError:
+                    pass  # Log-Datei ist optional
+            
+            # Fürs Fenster nur die neuesten Zeilen vormerken, verworfene zählen
+            overflow = len(self._display_lines) + len(lines) - self._display_lines.maxlen
+            if overflow > 0:
+                self._suppressed_count += overflow
+            self._display_lines.extend(lines)
+        
+        # Minimiert: Zeilen nur vormerken, das Widget wird erst nach dem Wiederherstellen aktualisiert
+        if not self._ui_visible or not self._display_lines:
+            return
+        
+        text = "\n".join(self._display_lines) + "\n"
+        self._display_lines.clear()
+        
+        # Verworfene (ältere) Zeilen als eine Zeile vor den übrigen melden
+        suppressed = self._suppressed_count
+        if suppressed:
+            self._suppressed_count = 0
+            text = f"... ({suppressed} Nachrichten unterdrückt) ...\n" + text
+        
+        self.log_text.insert(tk.END, text)
+        
+        # Nur die letzten LOG_MAX_LINES Zeilen behalten, damit das Widget nicht unbegrenzt wächst
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        if line_count > self.LOG_MAX_LINES:
+            self.log_text.delete('1.0', f'{line_count - self.LOG_MAX_LINES + 1}.0')
+        
         self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
+    
+    def _on_map_change(self, event):
+        """Merkt sich, ob das Hauptfenster sichtbar ist (<Map>) oder minimiert wurde (<Unmap>)"""
+        # Die Bindung am Hauptfenster gilt auch für alle Kind-Widgets
+        if event.widget is self.root:
+            self._ui_visible = event.type == tk.EventType.Map
+    
+    def _block_log_edit(self, event):
+        """Verhindert Eingaben im Log, erlaubt aber Navigation und Kopieren (Strg+C)"""
+        if event.keysym in self.LOG_READONLY_KEYS:
+            return None
+        if event.state & 0x4 and event.keysym.lower() == 'c':
+            return None
+        return "break"
+    
+    def _close_log_file(self):
+        """Schreibt wartende Nachrichten und schließt die Log-Datei des Parsing-Laufs"""
+        self._write_log_queue()
+        if self._log_file:
+            try:
+                self._log_file.close()
+            except OSError:
+                pass
+            self._log_file = None
     
     def _clear_log(self):
         """Leert das Log"""
-        self.log_text.config(state='normal')
+        # Wartende Nachrichten gehören noch in die Log-Datei
+        self._write_log_queue()
+        self._suppressed_count = 0
+        self._display_lines.clear()
         self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state='disabled')
     
     def _update_progress(self, message: str):
         """Callback für Fortschrittsmeldungen vom Parser"""
-        self.root.after(0, lambda: self._log(message))
+        self._log(message)
+    
+    def _update_file_progress(self, files_done: int, files_total: int):
+        """Callback vom Parser nach jeder Datei - der Fortschrittsbalken wird in _flush_log gesetzt"""
+        # Jedes Verzeichnis hat den gleichen Anteil am Gesamtfortschritt
+        directory_share = files_done / files_total if files_total else 1
+        self._progress_percent = int(100 * (self._progress_directory_index + directory_share) / self._progress_directory_count)
     
     def _start_parsing(self):
         """Startet den Parsing-Prozess"""
@@ -738,11 +681,8 @@ class LogParserApp:
         else:
             output_path = self.output_path_var.get()
             if not output_path:
-                messagebox.showwarning(
-                    "No Output File",
-                    "Please select an output file."
-                )
-                return
+                # No file selected: default name with the start time of this run
+                output_path = str(self.default_output_dir / f"logparser_results_{datetime.now():%Y%m%d_%H%M%S}.csv")
             
             # Validate output directory
             output_dir = Path(output_path).parent
@@ -768,13 +708,28 @@ class LogParserApp:
                 return
         
         self.is_parsing = True
+        self._cancel_event.clear()
         self.start_btn.config(state='disabled')
         self.stop_btn.config(state='normal')
         self.status_var.set("Parsing in progress...")
-        self.progress.start()
+        self._progress_directory_index = 0
+        self._progress_directory_count = len(self.directories)
+        self._progress_percent = 0
+        self._shown_percent = 0
+        self.progress.configure(value=0)
+        
+        # Write the full log of this run next to the output file (the log widget only keeps the last lines)
+        log_path = Path(output_path).with_name(f"{Path(output_path).stem}_log.txt")
+        try:
+            self._log_file = open(log_path, 'a', encoding='utf-8', buffering=8192)
+        except OSError as e:
+            self._log_file = None
+            self._log(f"Warning: Could not open log file {log_path}: {e}")
         
         self._log("=" * 50)
         self._log("Parsing started")
+        if self._log_file:
+            self._log(f"Log file: {log_path}")
         self._log(f"Directories: {len(self.directories)}")
         
         # Starte Parsing in separatem Thread
@@ -784,42 +739,92 @@ class LogParserApp:
     
     def _parse_thread(self, output_path: str):
         """Thread-Funktion für das Parsing"""
+        # Parser/Exporter erst hier laden, damit das Fenster beim Start ohne sie erscheint
+        from core import LogParser, ParsePool, CSVExporter
+        from core.avstumpfl_parser import AVStumpflLogParser
+        from core.avstumpfl_exporter import AVStumpflCSVExporter
+        from core.summary_exporter import SummaryExporter
+        
+        cleanup = ExitStack()  # Detail-CSV stream and parser worker processes, closed after the directory loop
+        final_dialog = None  # Shown only after the UI has been reset
+        partial_detail_path = None  # Streamed detail CSV, renamed only after a complete run
         try:
             all_results = []
+            total_count = 0
+            total_skipped = 0
             mode = self.parser_mode.get()
+            output_base = Path(output_path).stem
+            output_dir = Path(output_path).parent
+            detail_path = output_dir / f"{output_base}_detail.csv"
+            partial_detail_path = detail_path.with_name(detail_path.name + ".part")
             
             self._log(f"Parser-Modus: {'AV Stumpfl Format' if mode == 'avstumpfl' else 'Generischer Modus'}")
             
+            # Im generischen Modus wird die Detail-CSV direkt pro Verzeichnis geschrieben.
+            # Der AV-Parser liefert kumulierte Ergebnisse, dort wird weiterhin am Ende exportiert.
+            stream_detail = mode != "avstumpfl" and self.export_detailed.get()
+            keep_results = not stream_detail or self.export_summary.get() or self.export_statistics.get()
+            write_detail_rows = None
+            
+            # One pool of worker processes for the whole run, started only when needed
+            pool = ParsePool()
+            cleanup.callback(pool.close)
+            
             # Create ONE parser for all directories
             # This enables global duplicate detection across all logfiles
             if mode == "avstumpfl":
-                parser = AVStumpflLogParser(progress_callback=self._update_progress)
+                parser = AVStumpflLogParser(progress_callback=self._update_progress,
+                                            file_progress_callback=self._update_file_progress,
+                                            cancel_event=self._cancel_event,
+                                            pool=pool)
             else:
-                parser = LogParser(progress_callback=self._update_progress)
+                parser = LogParser(progress_callback=self._update_progress,
+                                   file_progress_callback=self._update_file_progress,
+                                   cancel_event=self._cancel_event,
+                                   pool=pool)
+                # Generic mode deduplicates per directory - directories can be parsed in parallel
+                parser.prefetch_directories(list(self.directories))
             
-            for directory in self.directories:
+            for directory_index, directory in enumerate(self.directories):
                 if not self.is_parsing:
                     break
                 
+                self._progress_directory_index = directory_index
                 self._log(f"Durchsuche Verzeichnis: {directory}")
                 
                 # Use the same parser for all directories
                 # This way identical errors are captured only once across all logfiles
                 results = parser.parse_directory(directory)
-                all_results.extend(results)
+                total_count += len(results)
+                if keep_results:
+                    all_results.extend(results)
+                
+                if stream_detail and results:
+                    if write_detail_rows is None:
+                        write_detail_rows = cleanup.enter_context(CSVExporter.open_stream(
+                            str(partial_detail_path),
+                            add_category=self.add_error_category.get()
+                        ))
+                    write_detail_rows(results)
+                
+                # Übersprungene Duplikate über alle Verzeichnisse summieren
+                if mode == "avstumpfl":
+                    # Der AV-Parser zählt bereits kumulativ über alle Verzeichnisse
+                    total_skipped = parser.skipped_duplicates
+                else:
+                    # LogParser setzt den Zähler pro Verzeichnis zurück
+                    total_skipped += parser.skipped_duplicates
                 
                 # Zeige Statistik inkl. übersprungener Duplikate
-                unique_count = len(all_results)
-                skipped_count = parser.skipped_duplicates
-                self.root.after(0, lambda u=unique_count, s=skipped_count: 
-                    self.stats_var.set(f"Unique Errors: {u} | Duplicates Skipped: {s}")
-                )
+                self._pending_stats = (total_count, total_skipped)
             
-            if self.is_parsing and all_results:
-                # Calculate base path for output files
-                output_base = Path(output_path).stem
-                output_dir = Path(output_path).parent
-                
+            cleanup.close()
+            
+            # Erst der vollständige Lauf ersetzt eine vorhandene Detail-CSV
+            if write_detail_rows is not None and self.is_parsing:
+                os.replace(partial_detail_path, detail_path)
+            
+            if self.is_parsing and total_count:
                 # Export Detailliert
                 if self.export_detailed.get():
                     # DATENBANK-MODUS: Erweitere bestehende Datenbank
@@ -852,31 +857,30 @@ class LogParserApp:
                     
                     # NORMALER MODUS: Erstelle neue CSV
                     else:
-                        self._log(f"Exportiere {len(all_results)} eindeutige entries (Detailliert)...")
-                        detail_path = output_dir / f"{output_base}_detail.csv"
-                        
-                        if mode == "avstumpfl":
+                        # Generischer Modus: bereits während des Parsens geschrieben
+                        if not stream_detail:
+                            self._log(f"Exportiere {len(all_results)} eindeutige entries (Detailliert)...")
                             AVStumpflCSVExporter.export(
                                 all_results, 
                                 str(detail_path),
                                 add_category=self.add_error_category.get()
                             )
-                        else:
-                            CSVExporter.export(
-                                all_results, 
-                                str(detail_path),
-                                add_category=self.add_error_category.get()
-                            )
                         
                         self._log(f"✓ Detailliert: {detail_path}")
                 
+                # Kennzahlen für Zusammenfassung und Statistik nur einmal berechnen
+                summary = None
+                if self.export_summary.get() or self.export_statistics.get():
+                    summary = SummaryExporter.aggregate(all_results)
+                
                 # Export Zusammengefasst
                 if self.export_summary.get():
                     self._log("Erstelle zusammengefasste Ansicht...")
                     summary_path = output_dir / f"{output_base}_summary.csv"
                     SummaryExporter.export_grouped_csv(
                         all_results, 
-                        str(summary_path)
+                        str(summary_path),
+                        summary=summary
                     )
                     self._log(f"✓ Zusammengefasst: {summary_path}")
                 
@@ -886,25 +890,14 @@ class LogParserApp:
                     stats_path = output_dir / f"{output_base}_statistics.txt"
                     SummaryExporter.export_statistics(
                         all_results,
-                        str(stats_path)
+                        str(stats_path),
+                        summary=summary
                     )
                     self._log(f"✓ Statistik: {stats_path}")
                 
-                # Zeige Anonymisierungs-Statistik
-                if anonymizer:
-                    anon_stats = anonymizer.get_stats()
-                    self._log("\nAnonymisierungs-Übersicht:")
-                    self._log(f"  - IPs anonymisiert: {anon_stats['ips_anonymized']}")
-                    self._log(f"  - Pfade anonymisiert: {anon_stats['paths_anonymized']}")
-                    self._log(f"  - Hostnamen anonymisiert: {anon_stats['hostnames_anonymized']}")
-                    self._log(f"  - Filenames anonymized: {anon_stats['filenames_anonymized']}")
-                
-                # Berechne Gesamtzahl übersprungener Duplikate
-                total_skipped = sum(p.skipped_duplicates for p in [parser] if hasattr(parser, 'skipped_duplicates'))
-                
                 # Erstelle Zusammenfassung
                 summary_msg = f"Parsing abgeschlossen!\n\n"
-                summary_msg += f"Unique Errors gefunden: {len(all_results)}\n"
+                summary_msg += f"Unique Errors gefunden: {total_count}\n"
                 summary_msg += f"Duplicates Skipped: {total_skipped}\n\n"
                 summary_msg += f"Exportierte Dateien:\n"
                 if self.export_detailed.get():
@@ -913,107 +906,39 @@ class LogParserApp:
                     summary_msg += f"  ✓ Zusammenfassung-CSV\n"
                 if self.export_statistics.get():
                     summary_msg += f"  ✓ Statistik-TXT\n"
-                if anonymizer:
-                    summary_msg += f"\n🔒 Data anonymized (ready for LLM training)"
                 
-                self.root.after(0, lambda: messagebox.showinfo("Finished", summary_msg))
-            elif not all_results:
+                final_dialog = (messagebox.showinfo, "Finished", summary_msg)
+            elif not total_count:
                 self._log("Keine Error gefunden.")
-                self.root.after(0, lambda: messagebox.showinfo(
+                final_dialog = (
+                    messagebox.showinfo,
                     "Finished",
                     "Parsing abgeschlossen, aber keine Error gefunden."
-                ))
+                )
         
         except Exception as e:
             import traceback
             self._log(f"ERROR: {str(e)}")
             self._log(traceback.format_exc())
-            self.root.after(0, lambda: messagebox.showerror(
+            final_dialog = (
+                messagebox.showerror,
                 "Error",
                 f"Ein Error ist aufgetreten:\n{str(e)}"
-            ))
+            )
         
         finally:
+            cleanup.close()
+            # Abgebrochener oder fehlgeschlagener Lauf: unvollständige Detail-CSV entfernen
+            if partial_detail_path is not None and partial_detail_path.exists():
+                try:
+                    partial_detail_path.unlink()
+                    self._log(f"Unvollständige Detail-CSV verworfen: {partial_detail_path}")
+                except OSError as e:
+                    self._log(f"Warning: Could not delete incomplete detail CSV: {e}")
             self._parsing_finished()
-    
-    def _create_temp_dir(self):
-        """Erstellt ein temporäres Verzeichnis im konfigurierten Temp-Folder"""
-        if self.custom_temp_dir:
-            # Use custom temp folder
-            return tempfile.mkdtemp(prefix="logparser_zip_", dir=self.custom_temp_dir)
-        else:
-            # Verwende System-Temp
-            return tempfile.mkdtemp(prefix="logparser_zip_")
-    
-    def _select_temp_directory(self):
-        """Lets user select a temp folder for ZIP extraction"""
-        directory = filedialog.askdirectory(
-            title="Select Temp Folder for ZIP Extraction",
-            initialdir=self.custom_temp_dir if self.custom_temp_dir else Path.home()
-        )
-        
-        if directory:
-            directory = Path(directory)
-            
-            # Check if directory is writable
-            test_file = directory / ".logparser_write_test"
-            try:
-                test_file.write_text("test")
-                test_file.unlink()
-                
-                self.custom_temp_dir = str(directory)
-                self.temp_dir_var.set(str(directory))
-                self._update_temp_space_info()
-                self._log(f"Temp Folder Set: {directory}")
-                
-                messagebox.showinfo(
-                    "Temp Folder Set",
-                    f"ZIP-Dateien werden nun extrahiert nach:\n{directory}"
-                )
-            except Exception as e:
-                messagebox.showerror(
-                    "Error",
-                    f"Verzeichnis ist nicht beschreibbar:\n{directory}\n\nError: {e}"
-                )
-    
-    def _reset_temp_directory(self):
-        """Resets temp folder to system default"""
-        self.custom_temp_dir = None
-        self.temp_dir_var.set("Standard (System Temp)")
-        self._update_temp_space_info()
-        self._log("Temp folder reset to system default")
-    
-    def _update_temp_space_info(self):
-        """Aktualisiert die Anzeige des verfügbaren Speicherplatzes"""
-        try:
-            if self.custom_temp_dir:
-                temp_path = Path(self.custom_temp_dir)
-            else:
-                temp_path = Path(tempfile.gettempdir())
-            
-            # Hole Laufwerk-Informationen
-            import shutil
-            usage = shutil.disk_usage(temp_path)
-            free_gb = usage.free / (1024**3)
-            total_gb = usage.total / (1024**3)
-            percent_free = (usage.free / usage.total) * 100
-            
-            # Farbe basierend auf verfügbarem Speicher
-            if free_gb < 5:
-                color = 'red'
-                warning = ' ⚠️ WENIG SPEICHER!'
-            elif free_gb < 20:
-                color = 'orange'
-                warning = ' ⚠️'
-            else:
-                color = 'green'
-                warning = ''
-            
-            info_text = f"Laufwerk {temp_path.drive if hasattr(temp_path, 'drive') else temp_path}: {free_gb:.1f} GB frei von {total_gb:.1f} GB ({percent_free:.1f}%){warning}"
-            self.temp_space_label.config(text=info_text, foreground=color)
-            
-        except Exception as e:
-            self.temp_space_label.config(text=f"Speicherplatz-Info nicht verfügbar: {e}", foreground='gray')
+            # After _reset_ui: the modal dialog must not hold back re-enabling the buttons
+            if final_dialog:
+                self.root.after(0, *final_dialog)
     
     def _toggle_database_mode(self):
         """Aktiviert/Deaktiviert den Datenbank-Modus"""
@@ -1143,12 +1068,6 @@ class LogParserApp:
                         self.use_database_mode.set(config.get('use_database_mode', False))
                         print(f"Einstellungen geladen: Datenbank {db_path.name}")
                 
-                # Lade Custom Temp Dir
-                if 'custom_temp_dir' in config and config['custom_temp_dir']:
-                    temp_path = Path(config['custom_temp_dir'])
-                    if temp_path.exists():
-                        self.custom_temp_dir = str(temp_path)
-                
         except Exception as e:
             # Error beim Laden ignorieren - verwende Defaults
             print(f"Hinweis: Konnte Einstellungen nicht laden: {e}")
@@ -1160,8 +1079,7 @@ class LogParserApp:
             
             config = {
                 'database_file': self.database_file,
-                'use_database_mode': self.use_database_mode.get(),
-                'custom_temp_dir': self.custom_temp_dir
+                'use_database_mode': self.use_database_mode.get()
             }
             
             import json
@@ -1197,17 +1115,9 @@ class LogParserApp:
             if self.use_database_mode.get():
                 self.db_load_btn.config(state='normal')
                 self.db_new_btn.config(state='normal')
-        
-        # Custom Temp Dir anzeigen
-        if self.custom_temp_dir:
-            self.temp_dir_var.set(self.custom_temp_dir)
-            try:
-                self._update_temp_space_info()
-            except:
-                pass
     
     def _cleanup_old_temp_dirs(self):
-        """Deletes all old logparser_zip_* directories on program startup"""
+        """Deletes logparser_zip_* directories left by older versions that extracted ZIPs (runs in a background thread)"""
         try:
             # Cleanup in system temp
             temp_base = Path(tempfile.gettempdir())
@@ -1229,133 +1139,21 @@ class LogParserApp:
             
             if total_size > 0:
                 size_mb = total_size / (1024 * 1024)
-                # Log nur ausgeben wenn UI bereits existiert
-                # Beim Startup ist self.log_text noch nicht initialisiert
-                try:
-                    if hasattr(self, 'log_text'):
-                        self._log(f"Startup: {total_cleaned} old cache directories deleted ({size_mb:.1f} MB freed)")
-                    else:
-                        print(f"Startup: {total_cleaned} old cache directories deleted ({size_mb:.1f} MB freed)")
-                except:
-                    print(f"Startup: {total_cleaned} old cache directories deleted ({size_mb:.1f} MB freed)")
+                # _log ist threadsicher, die Anzeige folgt mit dem nächsten _flush_log
+                self._log(f"Startup: {total_cleaned} old cache directories deleted ({size_mb:.1f} MB freed)")
         except Exception as e:
             # Startup-Error nicht kritisch - einfach loggen
-            print(f"Startup cleanup warning: {e}")
-    
-    def _manual_cache_cleanup(self):
-        """Manual cache clearing - all logparser temp directories"""
-        try:
-            # Sammle Verzeichnisse aus beiden Locations
-            all_dirs = []
-            
-            # System-Temp
-            temp_base = Path(tempfile.gettempdir())
-            all_dirs.extend(list(temp_base.glob("logparser_zip_*")))
-            
-            # Benutzerdefinierter Temp-Folder (falls gesetzt)
-            if self.custom_temp_dir:
-                custom_base = Path(self.custom_temp_dir)
-                all_dirs.extend(list(custom_base.glob("logparser_zip_*")))
-            
-            # Duplikate entfernen
-            all_dirs = list(set(all_dirs))
-            
-            if not all_dirs:
-                messagebox.showinfo(
-                    "Clear Cache",
-                    "No cache found. The cache is already empty."
-                )
-                return
-            
-            # Berechne Gesamtgröße
-            total_size = 0
-            for cache_dir in all_dirs:
-                try:
-                    size = sum(f.stat().st_size for f in cache_dir.rglob('*') if f.is_file())
-                    total_size += size
-                except:
-                    pass
-            
-            size_mb = total_size / (1024 * 1024)
-            
-            # Zeige Locations
-            locations_info = "System-Temp"
-            if self.custom_temp_dir:
-                locations_info += f" + {self.custom_temp_dir}"
-            
-            # Bestätigung vom User
-            result = messagebox.askyesno(
-                "Clear Cache",
-                f"Found: {len(all_dirs)} cache directories ({size_mb:.1f} MB)\n"
-                f"Location(s): {locations_info}\n\n"
-                f"Alle cache directories löschen?\n\n"
-                f"Note: This will also delete extracted ZIP files from the current list."
-            )
-            
-            if result:
-                deleted_count = 0
-                freed_size = 0
-                
-                for cache_dir in all_dirs:
-                    try:
-                        size = sum(f.stat().st_size for f in cache_dir.rglob('*') if f.is_file())
-                        shutil.rmtree(cache_dir)
-                        deleted_count += 1
-                        freed_size += size
-                    except Exception as e:
-                        self._log(f"Warning: Could not delete {cache_dir.name}  {e}")
-                
-                # Eigene temp_dirs Liste leeren
-                self.temp_dirs.clear()
-                
-                # Update list - remove deleted directories
-                remaining_dirs = []
-                for directory in self.directories:
-                    if Path(directory).exists():
-                        remaining_dirs.append(directory)
-                    else:
-                        self._log(f"Removed from list (deleted): {directory}")
-                
-                self.directories = remaining_dirs
-                self._update_directory_list()
-                
-                freed_mb = freed_size / (1024 * 1024)
-                messagebox.showinfo(
-                    "Cache Cleared",
-                    f"Successfully deleted:\n"
-                    f"• {deleted_count} cache directories\n"
-                    f"• {freed_mb:.1f} MB Speicherplatz freigegeben"
-                )
-                self._log(f"Cache manuell geleert: {deleted_count} Verzeichnisse, {freed_mb:.1f} MB freed")
-        
-        except Exception as e:
-            messagebox.showerror(
-                "Error",
-                f"Error beim Leeren des Cache:\n{str(e)}"
-            )
-    
-    def _cleanup_temp_dirs(self):
-        """Deletes all temporary directories of this session"""
-        for temp_dir in self.temp_dirs:
-            try:
-                if Path(temp_dir).exists():
-                    shutil.rmtree(temp_dir)
-                    self._log(f"Temporary directory deleted: {temp_dir}")
-            except Exception as e:
-                self._log(f"Warning: Could not delete temporary directory: {e}")
-        self.temp_dirs.clear()
+            self._log(f"Startup cleanup warning: {e}")
     
     def _stop_parsing(self):
         """Aborts the parsing process"""
         self.is_parsing = False
+        self._cancel_event.set()
         self._log("Parsing aborted by user")
     
     def _parsing_finished(self):
         """Called when parsing is finished"""
         self.root.after(0, self._reset_ui)
-        # NO cleanup after parsing - temp_dirs are still needed
-        # for re-parsing with different settings
-        # Cleanup only occurs on close or manual removal
     
     def _reset_ui(self):
         """Resets the UI"""
@@ -1363,59 +1161,17 @@ class LogParserApp:
         self.start_btn.config(state='normal')
         self.stop_btn.config(state='disabled')
         self.status_var.set("Ready")
-        self.progress.stop()
+        self._close_log_file()
     
     def run(self):
         """Startet die Anwendung"""
-        # Cleanup beim Schließen
+        # Einstellungen beim Schließen speichern
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         self.root.mainloop()
     
     def _on_closing(self):
-        """Wird beim Schließen des Fensters aufgerufen - Automatisches Cache-Cleanup"""
+        """Wird beim Schließen des Fensters aufgerufen"""
         # Speichere Einstellungen vor dem Schließen
         self._save_settings()
-        
-        try:
-            # Sammle alle logparser_zip_* Verzeichnisse aus beiden Locations
-            all_temp_dirs = []
-            
-            # System-Temp
-            temp_base = Path(tempfile.gettempdir())
-            all_temp_dirs.extend(list(temp_base.glob("logparser_zip_*")))
-            
-            # Benutzerdefinierter Temp-Folder (falls gesetzt)
-            if self.custom_temp_dir:
-                custom_base = Path(self.custom_temp_dir)
-                all_temp_dirs.extend(list(custom_base.glob("logparser_zip_*")))
-            
-            # Duplikate entfernen
-            all_temp_dirs = list(set(all_temp_dirs))
-            
-            # Lösche alle gefundenen Verzeichnisse
-            if all_temp_dirs:
-                deleted_count = 0
-                total_size = 0
-                
-                for temp_dir in all_temp_dirs:
-                    try:
-                        # Calculate size before deletion
-                        size = sum(f.stat().st_size for f in temp_dir.rglob('*') if f.is_file())
-                        total_size += size
-                        shutil.rmtree(temp_dir)
-                        deleted_count += 1
-                    except Exception as e:
-                        # Error ignorieren - evtl. von anderer Instanz verwendet
-                        pass
-                
-                if deleted_count > 0:
-                    size_mb = total_size / (1024 * 1024)
-                    print(f"Exit cleanup: {deleted_count} cache directories gelöscht ({size_mb:.1f} MB freed)")
-        
-        except Exception as e:
-            # Cleanup-Error beim Beenden sind nicht kritisch
-            print(f"Exit cleanup warning: {e}")
-        
-        finally:
-            # Fenster schließen
-            self.root.destroy()
+        self._close_log_file()
+        self.root.destroy()
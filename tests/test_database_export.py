@@ -0,0 +1,128 @@
+"""
+Test: Datenbank-Modus des AVStumpflCSVExporter
+Testet das direkte Anhängen an eine bestehende Datenbank-CSV und das
+Neuschreiben, wenn nicht angehängt werden kann
+"""
+import csv
+import unittest
+import tempfile
+import shutil
+import sys
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Python-Pfad hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.avstumpfl_exporter import AVStumpflCSVExporter
+
+
+# Tuple-Format: (Logfilename, Datum, Zeit, Severity, Type, Description)
+ENTRY_A = ('rx_logs/rx-log.txt', '2025-10-10', '12:00:00.000', 'error', 'Network', 'connection closed')
+ENTRY_B = ('pixera_logs/playback-27103-1.log', '2025-10-11', '08:30:00.500', 'warning', 'Playback', 'decoding frame failed')
+
+HEADER = ['Log-Kategorie', 'Ordner', 'Logfile-Gruppe', 'Dateiname-Original', 'Anzahl', 'Fehler-Kategorie',
+          'Datum', 'Zeit', 'Severity', 'Type/Source', 'Description']
+
+
+class TestDatabaseExport(unittest.TestCase):
+    def setUp(self):
+        """Erstelle temporäre Test-Umgebung"""
+        self.test_dir = tempfile.mkdtemp()
+        self.database = Path(self.test_dir) / "fehler_datenbank.csv"
+
+    def tearDown(self):
+        """Räume temporäre Test-Umgebung auf"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _read_rows(self):
+        """Liest die Datenbank als Liste von Dicts"""
+        with open(self.database, 'r', newline='', encoding='utf-8-sig') as f:
+            return list(csv.DictReader(f))
+
+    def test_append_to_matching_database(self):
+        """
+        Test: Bei gleichem Header werden neue Einträge angehängt, bestehende Zeilen bleiben unverändert
+        """
+        AVStumpflCSVExporter.export_to_database([ENTRY_A], str(self.database))
+        self.assertTrue(AVStumpflCSVExporter._can_append_to_database(self.database, HEADER))
+
+        # Unnötig gequotetes Feld - beim Neuschreiben würde das csv-Modul die Quotes entfernen
+        original = self.database.read_bytes().replace(b',connection closed\r\n', b',"connection closed"\r\n')
+        self.assertIn(b'"connection closed"', original)
+        self.database.write_bytes(original)
+
+        _, new_entries, total_entries = AVStumpflCSVExporter.export_to_database(
+            [ENTRY_A, ENTRY_B], str(self.database)
+        )
+
+        self.assertEqual((new_entries, total_entries), (1, 2))
+        self.assertTrue(self.database.read_bytes().startswith(original), "Datenbank wurde neu geschrieben")
+        rows = self._read_rows()
+        self.assertEqual([row['Description'] for row in rows], ['connection closed', 'decoding frame failed'])
+        self.assertEqual(rows[1]['Logfile-Gruppe'], 'playback-27103.log')
+
+    def test_known_entries_are_not_appended_again(self):
+        """
+        Test: Bereits enthaltene Fehler (Severity|Type/Source|Description) werden nicht erneut angehängt
+        """
+        AVStumpflCSVExporter.export_to_database([ENTRY_A, ENTRY_B], str(self.database))
+        before = self.database.read_bytes()
+
+        _, new_entries, total_entries = AVStumpflCSVExporter.export_to_database([ENTRY_B], str(self.database))
+
+        self.assertEqual((new_entries, total_entries), (0, 2))
+        self.assertEqual(self.database.read_bytes(), before)
+
+    def test_database_without_trailing_newline(self):
+        """
+        Test: Fehlt das abschließende CRLF, wird neu geschrieben statt die letzte Zeile zu verlängern
+        """
+        AVStumpflCSVExporter.export_to_database([ENTRY_A], str(self.database))
+        self.database.write_bytes(self.database.read_bytes().rstrip(b'\r\n'))
+        self.assertFalse(AVStumpflCSVExporter._can_append_to_database(self.database, HEADER))
+
+        _, new_entries, total_entries = AVStumpflCSVExporter.export_to_database([ENTRY_B], str(self.database))
+
+        self.assertEqual((new_entries, total_entries), (1, 2))
+        rows = self._read_rows()
+        self.assertEqual([row['Description'] for row in rows], ['connection closed', 'decoding frame failed'])
+        self.assertTrue(self.database.read_bytes().endswith(b'\r\n'))
+
+    def test_header_mismatch_rewrites_database(self):
+        """
+        Test: Bei anderem Header wird die Datenbank im neuen Format neu geschrieben
+        """
+        AVStumpflCSVExporter.export_to_database([ENTRY_A], str(self.database), add_category=False)
+        self.assertFalse(AVStumpflCSVExporter._can_append_to_database(self.database, HEADER))
+
+        _, new_entries, total_entries = AVStumpflCSVExporter.export_to_database([ENTRY_B], str(self.database))
+
+        self.assertEqual((new_entries, total_entries), (1, 2))
+        with open(self.database, 'r', newline='', encoding='utf-8-sig') as f:
+            self.assertEqual(next(csv.reader(f)), HEADER)
+        rows = self._read_rows()
+        self.assertEqual([row['Description'] for row in rows], ['connection closed', 'decoding frame failed'])
+        # Bestehende Zeile erhält die neue Spalte leer, neue Zeile wird kategorisiert
+        self.assertEqual(rows[0]['Fehler-Kategorie'], '')
+        self.assertEqual(rows[1]['Fehler-Kategorie'], 'Media')
+
+    def test_unknown_column_raises_and_keeps_database(self):
+        """
+        Test: Spalten, die beim Neuschreiben verloren gingen, führen zu ValueError - die Datei bleibt unverändert
+        """
+        with open(self.database, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER + ['Notiz'])
+            writer.writerow(['rx_logs', '', 'rx-log.txt', 'rx-log.txt', '1', 'Netzwerk', '2025-10-10',
+                             '12:00:00.000', 'error', 'Network', 'connection closed', 'bekannt'])
+        before = self.database.read_bytes()
+
+        with self.assertRaises(ValueError) as context:
+            AVStumpflCSVExporter.export_to_database([ENTRY_B], str(self.database))
+
+        self.assertIn('Notiz', str(context.exception))
+        self.assertEqual(self.database.read_bytes(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
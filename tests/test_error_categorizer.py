@@ -0,0 +1,83 @@
+"""
+Test: Zusammengefasste Kategorie-Regexes im ErrorCategorizer
+Testet, dass die pro Kategorie zusammengefasste Regex genauso kategorisiert
+wie die einzelnen Patterns nacheinander
+"""
+import re
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Python-Pfad hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.error_categorizer import ErrorCategorizer, _merge_patterns
+
+
+def _categorize_per_pattern(error_message: str, error_type: str = '') -> str:
+    """Referenz: Jede Kategorie Pattern für Pattern prüfen"""
+    combined_text = f"{error_type} {error_message}".lower()
+    for category, patterns in ErrorCategorizer.CATEGORIES.items():
+        for pattern in patterns:
+            if re.search(pattern, combined_text, re.IGNORECASE):
+                return category
+    return 'Sonstige'
+
+
+class TestErrorCategorizer(unittest.TestCase):
+    def test_merged_regex_matches_per_pattern_loop(self):
+        """
+        Test: Zufällige Meldungen aus den Wörtern aller Patterns werden gleich kategorisiert
+        """
+        # Teilstücke aller Patterns (ohne Regex-Syntax) plus Füllwörter
+        words = sorted({
+            re.sub(r'\\d\+?', '2', part).replace('\\\\', '\\').replace('\\.', '.')
+            for patterns in ErrorCategorizer.CATEGORIES.values()
+            for pattern in patterns
+            for part in pattern.split('.*')
+        })
+        words += ['x', ' ', ':', 'failed', 'file', 'not', 'found', '192.168.1.5', '\\\\', 'Error', 'FILE']
+
+        rng = random.Random(42)
+        for _ in range(20000):
+            message = ''.join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+            error_type = rng.choice(['', 'network', 'Playback', 'module'])
+            self.assertEqual(
+                ErrorCategorizer.categorize(message, error_type),
+                _categorize_per_pattern(message, error_type),
+                f"{error_type!r} {message!r}"
+            )
+
+    def test_every_pattern_is_recognized(self):
+        """
+        Test: Jedes einzelne Pattern führt zu derselben Kategorie wie die Referenz
+        """
+        samples = [
+            "connection was closed", "network path was not found", "timeout", "smb2 mount failed",
+            "\\\\192.168.1.5\\share", "file not found", "end of file", "permission denied",
+            "access violation", "authenticating user", "login failed", "decoding frame failed",
+            "dll not found", "system time changed", "bad timestamp", "nothing to see",
+        ]
+        for message in samples:
+            self.assertEqual(ErrorCategorizer.categorize(message), _categorize_per_pattern(message), message)
+
+    def test_unmergeable_patterns_are_rejected(self):
+        """
+        Test: Patterns mit Alternativen, Gruppen oder ungültigen Teilstücken werden abgelehnt
+        """
+        for pattern in ['network|error', '(connection).*closed', 'file.*?found', '[.*]', 'a\\.*b', '.*timeout']:
+            with self.assertRaises(ValueError, msg=pattern):
+                _merge_patterns([pattern])
+
+    def test_prefix_pattern_covers_longer_pattern(self):
+        """
+        Test: Ein kürzeres Pattern deckt längere mit gleichem Anfang ab
+        """
+        merged = _merge_patterns(['authenticating', 'authenticating.*failed', 'connection.*closed'])
+
+        self.assertEqual(merged, '(?:authenticating|connection.*closed)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Test: Blockweises Einlesen im LogParser
+Testet, dass das Lesen in Byte-Blöcken dieselben Zeilen liefert wie das
+zeilenweise Lesen im Textmodus (Zeilenenden, Blockgrenzen, Kodierung)
+"""
+import io
+import zipfile
+import unittest
+import tempfile
+import shutil
+import sys
+from pathlib import Path
+
+# Füge das Projektverzeichnis zum Python-Pfad hinzu
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.log_parser import (LogParser, generalize_file_paths, _read_line_blocks, _iter_severity_lines,
+                             _READ_BLOCK_SIZE)
+
+
+def _parse_text_mode(file_path: Path):
+    """Referenz: Zeilenweises Lesen im Textmodus wie vor dem blockweisen Einlesen"""
+    parser = LogParser()
+    results = []
+    seen = set()
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            severity = parser._detect_severity(line) if line else None
+            if severity:
+                generalized_line = generalize_file_paths(line)
+                if generalized_line not in seen:
+                    seen.add(generalized_line)
+                    results.append((str(file_path), severity, generalized_line))
+    return results
+
+
+class TestLogParserReading(unittest.TestCase):
+    def setUp(self):
+        """Erstelle temporäre Test-Umgebung"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Räume temporäre Test-Umgebung auf"""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _parse_bytes(self, data: bytes):
+        """Schreibt data als einzige Logfile und liefert (Ergebnis, Referenz-Ergebnis)"""
+        log_file = Path(self.test_dir) / "log.txt"
+        log_file.write_bytes(data)
+        return LogParser().parse_directory(self.test_dir), _parse_text_mode(log_file)
+
+    def test_line_split_across_blocks(self):
+        """
+        Test: Eine Zeile, die über eine Blockgrenze reicht, wird als ganze Zeile gefunden
+        """
+        data = b"info start\nsome error in a long line\nwarning tail\n"
+
+        for block_size in range(1, len(data) + 1):
+            blocks = list(_read_line_blocks(io.BytesIO(data), block_size))
+
+            # Blöcke ergeben zusammen die Datei und enden (außer evtl. dem letzten) an \n
+            self.assertEqual(b"".join(blocks), data)
+            for block in blocks[:-1]:
+                self.assertTrue(block.endswith(b"\n"), f"block_size={block_size}: {block!r}")
+
+            lines = [line for block in blocks for line in _iter_severity_lines(block)]
+            self.assertEqual(lines, [b"some error in a long line\n", b"warning tail\n"],
+                             f"block_size={block_size}")
+
+    def test_lone_cr_line_endings(self):
+        """
+        Test: Einzelnes \\r trennt Zeilen wie im Textmodus
+        """
+        results, expected = self._parse_bytes(b"info ok\rerror one\rwarning two\r\nfatal three")
+
+        self.assertEqual([entry[2] for entry in results], ["error one", "warning two", "fatal three"])
+        self.assertEqual(results, expected)
+
+    def test_crlf_line_endings(self):
+        """
+        Test: CRLF-Zeilenenden landen nicht im Eintragstext
+        """
+        results, expected = self._parse_bytes(b"error a\r\nwarning b\r\n")
+
+        self.assertEqual([entry[2] for entry in results], ["error a", "warning b"])
+        self.assertEqual(results, expected)
+
+    def test_file_without_trailing_newline(self):
+        """
+        Test: Die letzte Zeile wird auch ohne abschließendes Zeilenende gefunden
+        """
+        results, expected = self._parse_bytes(b"info first\nerror last line")
+
+        self.assertEqual([entry[2] for entry in results], ["error last line"])
+        self.assertEqual(results, expected)
+
+    def test_non_utf8_file(self):
+        """
+        Test: Ungültige UTF-8 Bytes werden wie im Textmodus ignoriert
+        """
+        data = "error café\nwarning Größe\n".encode('latin-1') + b"\xff\xfefatal \xc3 x\n"
+        results, expected = self._parse_bytes(data)
+
+        self.assertEqual([entry[2] for entry in results], ["error caf", "warning Gre", "fatal  x"])
+        self.assertEqual(results, expected)
+
+    def test_mixed_content_matches_text_mode(self):
+        """
+        Test: Gemischte Zeilenenden, Keywords in Groß-/Kleinschreibung und Duplikate
+        """
+        data = (b"\xef\xbb\xbfERROR first\r\n\r\nWarning C:\\a\\b.mov\rwarning C:\\c.mov\n"
+                b"errors are not words\n\tCritical \xe2\x80\xa8 thing\n \n critical\x0bsplit\nerror first")
+        results, expected = self._parse_bytes(data)
+
+        self.assertEqual(results, expected)
+
+    def test_zip_entry_read_in_blocks(self):
+        """
+        Test: Ein ZIP-Eintrag über mehrere Blöcke liefert dieselben Zeilen wie das Dekodieren am Stück
+        """
+        # Füllzeilen ohne Keyword, damit die Fehlerzeilen über mehrere Blöcke verteilt sind
+        filler = b"info " + b"." * 120 + b"\r\n"
+        lines = [filler * 50 + b"error n%d \xc3\x0bcritical split %d\rwarning \xe2\x80\xa8 x%d\n" % (i, i, i)
+                 for i in range(400)]
+        data = b"".join(lines) + b"fatal last"
+        self.assertGreater(len(data), 2 * _READ_BLOCK_SIZE)
+        with zipfile.ZipFile(Path(self.test_dir) / "logs.zip", 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr("sub/log.txt", data)
+
+        # Referenz: ganzen Eintrag dekodieren und mit str.splitlines() trennen
+        reference = LogParser()
+        for line in data.decode('utf-8', errors='ignore').splitlines():
+            line = line.strip()
+            if line:
+                reference._process_line(line, "logs.zip/sub/log.txt", "logs.zip/sub/log.txt")
+
+        results = LogParser().parse_directory(self.test_dir)
+
+        self.assertGreater(len(results), len(lines))
+        self.assertEqual(results, reference.results)
+
+    def test_nested_zip_entries(self):
+        """
+        Test: .txt Einträge von ZIP-Archiven, die in einem ZIP liegen, werden mit geparst
+        """
+        inner = io.BytesIO()
+        with zipfile.ZipFile(inner, 'w') as zip_ref:
+            zip_ref.writestr("logs/inner.txt", b"info ok\nerror inside nested zip\n")
+        with zipfile.ZipFile(Path(self.test_dir) / "outer.zip", 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            zip_ref.writestr("outer.txt", b"warning outer entry\n")
+            zip_ref.writestr("sub/inner.zip", inner.getvalue())
+            zip_ref.writestr("broken.zip", b"not a zip")
+
+        messages = []
+        results = LogParser(progress_callback=messages.append).parse_directory(self.test_dir)
+
+        self.assertEqual(results, [
+            ("outer.zip/outer.txt", "warning", "warning outer entry"),
+            ("outer.zip/sub/inner.zip/logs/inner.txt", "error", "error inside nested zip"),
+        ])
+        self.assertTrue(any("broken.zip" in message for message in messages), messages)
+
+
+if __name__ == '__main__':
+    unittest.main()